@@ -1,21 +1,61 @@
-from django.apps import AppConfig
-from django.db.models.signals import post_migrate
+from django.apps import AppConfig, apps
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Q
+from django.db.models.signals import post_migrate, pre_migrate
 
+STORE_APP_LABELS = ('catalog', 'orders', 'payments')
+STORE_ADMIN_GROUP = 'Store Admin'
+STORE_STAFF_GROUP = 'Store Staff'
+STORE_GROUP_NAMES = (STORE_ADMIN_GROUP, STORE_STAFF_GROUP)
+
+
+def _store_groups(Group, using):
+    groups = dict(Group.objects.using(using).filter(name__in=STORE_GROUP_NAMES).values_list('name', 'id'))
+    missing = [name for name in STORE_GROUP_NAMES if name not in groups]
+    if missing:
+        Group.objects.using(using).bulk_create([Group(name=name) for name in missing], ignore_conflicts=True)
+        groups = dict(Group.objects.using(using).filter(name__in=STORE_GROUP_NAMES).values_list('name', 'id'))
+    return groups
 
-def ensure_store_groups(sender, **kwargs):
-    if sender.label not in {'auth', 'catalog', 'orders', 'payments'}:
-        return
 
+def sync_store_groups(using=DEFAULT_DB_ALIAS):
     from django.contrib.auth.models import Group, Permission
 
-    store_perms = Permission.objects.filter(content_type__app_label__in=['catalog', 'orders', 'payments'])
-    auth_user_perms = Permission.objects.filter(content_type__app_label='auth', content_type__model='user')
+    store_perms = set()
+    auth_user_perms = set()
+    rows = Permission.objects.using(using).filter(
+        Q(content_type__app_label__in=STORE_APP_LABELS) | Q(content_type__app_label='auth', content_type__model='user')
+    ).values_list('id', 'content_type__app_label')
+    for perm_id, app_label in rows:
+        (auth_user_perms if app_label == 'auth' else store_perms).add(perm_id)
+
+    groups = _store_groups(Group, using)
+    staff_id, admin_id = groups[STORE_STAFF_GROUP], groups[STORE_ADMIN_GROUP]
+    desired = {(staff_id, perm_id) for perm_id in store_perms}
+    desired |= {(admin_id, perm_id) for perm_id in store_perms | auth_user_perms}
+
+    Grant = Group.permissions.through
+    existing = set(
+        Grant.objects.using(using).filter(group_id__in=groups.values()).values_list('group_id', 'permission_id')
+    )
+    missing = desired - existing
+    if missing:
+        Grant.objects.using(using).bulk_create(
+            [Grant(group_id=group_id, permission_id=perm_id) for group_id, perm_id in sorted(missing)],
+            ignore_conflicts=True,
+        )
+    return len(missing)
 
-    store_admin, _ = Group.objects.get_or_create(name='Store Admin')
-    store_staff, _ = Group.objects.get_or_create(name='Store Staff')
 
-    store_staff.permissions.add(*store_perms)
-    store_admin.permissions.add(*store_perms, *auth_user_perms)
+def _is_last_migrated_app(sender):
+    configs = [config for config in apps.get_app_configs() if config.models_module is not None]
+    return bool(configs) and configs[-1].label == sender.label
+
+
+def ensure_store_groups(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    if not _is_last_migrated_app(sender):
+        return
+    sync_store_groups(using=using)
 
 
 class AccountsConfig(AppConfig):
@@ -23,4 +63,7 @@ class AccountsConfig(AppConfig):
     name = 'accounts'
 
     def ready(self):
+        from dukango.database import lift_migration_timeouts
+
+        pre_migrate.connect(lift_migration_timeouts, dispatch_uid='dukango.database.lift_migration_timeouts')
         post_migrate.connect(ensure_store_groups, dispatch_uid='accounts.ensure_store_groups')
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from accounts.startup import ensure_store_permissions, ensure_superuser, has_unapplied_migrations
+
+
+class Command(BaseCommand):
+    help = 'Prepare the database for serving, skipping migrate, superuser and permission work that has not changed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Run every phase even if nothing changed.')
+        parser.add_argument('--retries', type=int, default=10)
+        parser.add_argument('--retry-delay', type=float, default=5.0)
+
+    def _phase(self, name, func):
+        started = time.perf_counter()
+        result = func()
+        self.stdout.write(f"[startup] {name}: {result} ({time.perf_counter() - started:.2f}s)")
+        return result
+
+    def _migrate(self, force, retries, delay):
+        for attempt in range(1, retries + 1):
+            try:
+                if not force and not has_unapplied_migrations():
+                    return 'up to date'
+                call_command('migrate', interactive=False, verbosity=0)
+                return 'applied'
+            except Exception as exc:
+                connections.close_all()
+                if attempt == retries:
+                    raise CommandError(f"Migrations failed after {attempt} attempts: {exc}") from exc
+                self.stderr.write(f"Migrations failed (attempt {attempt}/{retries}): {exc}. Retrying in {delay:g}s...")
+                time.sleep(delay)
+
+    def handle(self, *args, **options):
+        force = options['force']
+        started = time.perf_counter()
+
+        self._phase('migrations', lambda: self._migrate(force, max(1, options['retries']), options['retry_delay']))
+        self._phase('superuser', lambda: ensure_superuser(force=force))
+        self._phase('permissions', lambda: ensure_store_permissions(force=force))
+
+        self.stdout.write(f"[startup] total: {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,10 @@
+from django.db import models
+
+
+class StartupFingerprint(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    digest = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.name
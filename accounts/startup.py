@@ -0,0 +1,120 @@
+import os
+
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models import Q
+from django.utils.crypto import salted_hmac
+
+from .apps import STORE_APP_LABELS, STORE_GROUP_NAMES, sync_store_groups
+from .models import StartupFingerprint
+
+SUPERUSER_FINGERPRINT = 'superuser'
+PERMISSIONS_FINGERPRINT = 'store_permissions'
+
+
+def has_unapplied_migrations(database=DEFAULT_DB_ALIAS):
+    executor = MigrationExecutor(connections[database])
+    return bool(executor.migration_plan(executor.loader.graph.leaf_nodes()))
+
+
+def _digest(name, *parts):
+    value = '\0'.join(str(part) for part in parts)
+    return salted_hmac(f"accounts.startup.{name}", value, algorithm='sha256').hexdigest()
+
+
+def read_fingerprint(name):
+    return StartupFingerprint.objects.filter(name=name).values_list('digest', flat=True).first()
+
+
+def write_fingerprint(name, digest):
+    StartupFingerprint.objects.update_or_create(name=name, defaults={'digest': digest})
+
+
+def _superuser_digest(username, email, password, force_reset, user):
+    return _digest(
+        SUPERUSER_FINGERPRINT,
+        username,
+        email,
+        password,
+        force_reset,
+        user.pk,
+        user.password,
+        user.is_active,
+        user.is_staff,
+        user.is_superuser,
+    )
+
+
+def ensure_superuser(force=False):
+    username = os.environ.get('DJANGO_SUPERUSER_USERNAME', '').strip()
+    email = os.environ.get('DJANGO_SUPERUSER_EMAIL', '').strip()
+    password = os.environ.get('DJANGO_SUPERUSER_PASSWORD', '')
+    force_reset = os.environ.get('DJANGO_SUPERUSER_FORCE_PASSWORD_RESET', '0') == '1'
+
+    if not username:
+        return 'not configured'
+
+    User = get_user_model()
+    user = User.objects.filter(username=username).first()
+    if (
+        not force
+        and user is not None
+        and read_fingerprint(SUPERUSER_FINGERPRINT) == _superuser_digest(username, email, password, force_reset, user)
+    ):
+        return 'unchanged'
+
+    created = user is None
+    if created:
+        user = User(username=username, email=email)
+
+    changed = created
+    if not user.is_active:
+        user.is_active = True
+        changed = True
+    if not user.is_staff:
+        user.is_staff = True
+        changed = True
+    if not user.is_superuser:
+        user.is_superuser = True
+        changed = True
+
+    if (created or force_reset) and password:
+        user.set_password(password)
+        changed = True
+
+    if changed:
+        user.save()
+
+    write_fingerprint(SUPERUSER_FINGERPRINT, _superuser_digest(username, email, password, force_reset, user))
+    return 'created' if created else ('updated' if changed else 'verified')
+
+
+def _permissions_digest():
+    from django.contrib.auth.models import Group, Permission
+
+    perm_ids = (
+        Permission.objects.filter(
+            Q(content_type__app_label__in=STORE_APP_LABELS) | Q(content_type__app_label='auth', content_type__model='user')
+        )
+        .order_by('id')
+        .values_list('id', flat=True)
+    )
+    grants = (
+        Group.permissions.through.objects.filter(group__name__in=STORE_GROUP_NAMES)
+        .order_by('group_id', 'permission_id')
+        .values_list('group_id', 'permission_id')
+    )
+    return _digest(
+        PERMISSIONS_FINGERPRINT,
+        ','.join(str(perm_id) for perm_id in perm_ids),
+        ','.join(f"{group_id}:{perm_id}" for group_id, perm_id in grants),
+    )
+
+
+def ensure_store_permissions(force=False):
+    if not force and read_fingerprint(PERMISSIONS_FINGERPRINT) == _permissions_digest():
+        return 'unchanged'
+    sync_store_groups()
+    write_fingerprint(PERMISSIONS_FINGERPRINT, _permissions_digest())
+    return 'synced'
@@ -0,0 +1,127 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.test import TestCase
+
+from catalog.models import Product
+
+from .apps import STORE_ADMIN_GROUP, STORE_STAFF_GROUP, sync_store_groups
+from .startup import ensure_store_permissions, ensure_superuser
+
+
+class SyncStoreGroupsTests(TestCase):
+    noop_queries = 3
+    grant_queries = 4
+
+    def _add_permissions(self, count):
+        content_type = ContentType.objects.get_for_model(Product)
+        start = Permission.objects.filter(codename__startswith='extra_').count()
+        Permission.objects.bulk_create(
+            [
+                Permission(content_type=content_type, codename=f"extra_{n}", name=f"Extra {n}")
+                for n in range(start, start + count)
+            ]
+        )
+
+    def test_noop_sync_is_constant_as_permissions_grow(self):
+        with self.assertNumQueries(self.noop_queries):
+            self.assertEqual(sync_store_groups(), 0)
+
+        self._add_permissions(300)
+        sync_store_groups()
+
+        with self.assertNumQueries(self.noop_queries):
+            self.assertEqual(sync_store_groups(), 0)
+
+    def test_granting_is_constant_as_permissions_grow(self):
+        self._add_permissions(1)
+        with self.assertNumQueries(self.grant_queries):
+            self.assertEqual(sync_store_groups(), 2)
+
+        self._add_permissions(150)
+        with self.assertNumQueries(self.grant_queries):
+            self.assertEqual(sync_store_groups(), 300)
+
+        staff = Group.objects.get(name=STORE_STAFF_GROUP)
+        admin = Group.objects.get(name=STORE_ADMIN_GROUP)
+        self.assertEqual(staff.permissions.filter(codename__startswith='extra_').count(), 151)
+        self.assertEqual(admin.permissions.filter(codename__startswith='extra_').count(), 151)
+
+
+class StartupTests(TestCase):
+    def _superuser_env(self, **values):
+        env = {
+            'DJANGO_SUPERUSER_USERNAME': 'owner',
+            'DJANGO_SUPERUSER_EMAIL': 'owner@example.com',
+            'DJANGO_SUPERUSER_PASSWORD': 'first-secret',
+            'DJANGO_SUPERUSER_FORCE_PASSWORD_RESET': '0',
+        }
+        env.update(values)
+        return mock.patch.dict('os.environ', env)
+
+    def test_superuser_unchanged_changed_and_forced(self):
+        with mock.patch.dict('os.environ', {'DJANGO_SUPERUSER_USERNAME': ''}):
+            self.assertEqual(ensure_superuser(), 'not configured')
+
+        with self._superuser_env():
+            self.assertEqual(ensure_superuser(), 'created')
+            self.assertEqual(ensure_superuser(), 'unchanged')
+            self.assertEqual(ensure_superuser(force=True), 'verified')
+
+            User = get_user_model()
+            User.objects.filter(username='owner').update(is_staff=False)
+            self.assertEqual(ensure_superuser(), 'updated')
+            self.assertTrue(User.objects.get(username='owner').is_staff)
+
+        with self._superuser_env(DJANGO_SUPERUSER_PASSWORD='second-secret'):
+            self.assertEqual(ensure_superuser(), 'verified')
+            self.assertTrue(User.objects.get(username='owner').check_password('first-secret'))
+
+    def test_force_reset_changes_password_once(self):
+        with self._superuser_env():
+            ensure_superuser()
+
+        with self._superuser_env(DJANGO_SUPERUSER_PASSWORD='second-secret', DJANGO_SUPERUSER_FORCE_PASSWORD_RESET='1'):
+            self.assertEqual(ensure_superuser(), 'updated')
+            self.assertEqual(ensure_superuser(), 'unchanged')
+
+        self.assertTrue(get_user_model().objects.get(username='owner').check_password('second-secret'))
+
+    def test_permissions_resync_when_a_grant_is_swapped(self):
+        self.assertEqual(ensure_store_permissions(), 'synced')
+        self.assertEqual(ensure_store_permissions(), 'unchanged')
+
+        staff = Group.objects.get(name=STORE_STAFF_GROUP)
+        removed = staff.permissions.order_by('id').first()
+        staff.permissions.remove(removed)
+        staff.permissions.add(Permission.objects.get(codename='add_user'))
+        self.assertEqual(ensure_store_permissions(), 'synced')
+        self.assertTrue(staff.permissions.filter(pk=removed.pk).exists())
+
+        self.assertEqual(ensure_store_permissions(force=True), 'synced')
+
+    def test_fast_start_skips_unchanged_phases(self):
+        out = StringIO()
+        with self._superuser_env():
+            call_command('fast_start', stdout=out)
+            call_command('fast_start', stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertIn('[startup] migrations: up to date', lines[0])
+        self.assertIn('[startup] superuser: created', lines[1])
+        self.assertIn('[startup] migrations: up to date', lines[4])
+        self.assertIn('[startup] superuser: unchanged', lines[5])
+        self.assertIn('[startup] permissions: unchanged', lines[6])
+
+    def test_fast_start_force_runs_every_phase(self):
+        out = StringIO()
+        with self._superuser_env():
+            call_command('fast_start', force=True, stdout=out)
+
+        self.assertIn('[startup] migrations: applied', out.getvalue())
+        self.assertIn('[startup] superuser: created', out.getvalue())
+        self.assertIn('[startup] permissions: synced', out.getvalue())
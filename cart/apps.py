@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.contrib.auth.signals import user_logged_in
 
 
 class CartConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'cart'
+
+    def ready(self):
+        from .storage import merge_cookie_cart
+
+        user_logged_in.connect(merge_cookie_cart, dispatch_uid='cart.merge_cookie_cart')
@@ -1,13 +1,8 @@
-def cart_item_count(request):
-    cart = request.session.get('cart', {})
-    if not isinstance(cart, dict):
-        return {'cart_item_count': 0}
+from .utils import get_cart_counts
 
-    count = 0
-    for qty in cart.values():
-        try:
-            count += int(qty)
-        except Exception:
-            continue
 
-    return {'cart_item_count': count}
+def cart_item_count(request):
+    return {
+        'cart_item_count': lambda: get_cart_counts(request)[0],
+        'cart_line_count': lambda: get_cart_counts(request)[1],
+    }
@@ -0,0 +1,10 @@
+class CartCookieMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        storage = getattr(request, '_cart_cookie', None)
+        if storage is not None:
+            storage.apply(response)
+        return response
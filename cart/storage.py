@@ -0,0 +1,181 @@
+from django.conf import settings
+from django.core import signing
+
+CART_SESSION_KEY = 'cart'
+CART_COUNT_SESSION_KEY = 'cart_count'
+CART_COOKIE_SALT = 'cart.storage'
+CART_COOKIE_MAX_LINES = 100
+
+
+def _cookie_name():
+    return getattr(settings, 'CART_COOKIE_NAME', 'cart')
+
+
+def _cookie_age():
+    return getattr(settings, 'CART_COOKIE_AGE', 60 * 60 * 24 * 30)
+
+
+def count_cart(cart):
+    total = 0
+    lines = 0
+    for qty in cart.values():
+        try:
+            qty = int(qty)
+        except (TypeError, ValueError):
+            continue
+        if qty > 0:
+            total += qty
+            lines += 1
+    return total, lines
+
+
+class SessionCartStorage:
+    def __init__(self, request):
+        self.request = request
+
+    def load(self):
+        cart = self.request.session.get(CART_SESSION_KEY)
+        if not isinstance(cart, dict):
+            cart = {}
+        return cart
+
+    def counts(self):
+        counts = self.request.session.get(CART_COUNT_SESSION_KEY)
+        if isinstance(counts, list) and len(counts) == 2:
+            return counts[0], counts[1]
+        if CART_SESSION_KEY not in self.request.session:
+            return 0, 0
+        counts = count_cart(self.load())
+        self.request.session[CART_COUNT_SESSION_KEY] = list(counts)
+        return counts
+
+    def save(self, cart, counts=None):
+        if counts is None:
+            counts = count_cart(cart)
+        self.request.session[CART_SESSION_KEY] = cart
+        self.request.session[CART_COUNT_SESSION_KEY] = list(counts)
+        self.request.session.modified = True
+
+    def clear(self):
+        self.save({}, (0, 0))
+
+
+class CookieCartStorage:
+    def __init__(self, request):
+        self.request = request
+        self._cart = None
+        self._counts = (0, 0)
+        self._dirty = False
+
+    @staticmethod
+    def encode(cart, counts=None):
+        cart = dict(list(cart.items())[:CART_COOKIE_MAX_LINES])
+        total, lines = count_cart(cart) if counts is None else counts
+        items = ','.join(f"{key}:{int(qty)}" for key, qty in cart.items())
+        return signing.TimestampSigner(salt=CART_COOKIE_SALT).sign(f"{total}.{lines}|{items}")
+
+    @staticmethod
+    def decode(value):
+        if not value:
+            return {}, (0, 0)
+        try:
+            raw = signing.TimestampSigner(salt=CART_COOKIE_SALT).unsign(value, max_age=_cookie_age())
+        except signing.BadSignature:
+            return {}, (0, 0)
+
+        header, sep, items = raw.partition('|')
+        if not sep:
+            header, items = '', raw
+
+        cart = {}
+        for line in items.split(','):
+            key, sep, qty = line.rpartition(':')
+            if not sep:
+                continue
+            try:
+                cart[key] = int(qty)
+            except ValueError:
+                continue
+
+        try:
+            total, lines = (int(part) for part in header.split('.'))
+        except ValueError:
+            total, lines = count_cart(cart)
+        return cart, (total, lines)
+
+    def _load(self):
+        if self._cart is None:
+            self._cart, self._counts = self.decode(self.request.COOKIES.get(_cookie_name()))
+
+    def load(self):
+        self._load()
+        return dict(self._cart)
+
+    def counts(self):
+        self._load()
+        return self._counts
+
+    def save(self, cart, counts=None):
+        if len(cart) > CART_COOKIE_MAX_LINES:
+            cart = dict(list(cart.items())[:CART_COOKIE_MAX_LINES])
+            counts = None
+        self._cart = dict(cart)
+        self._counts = count_cart(cart) if counts is None else tuple(counts)
+        self._dirty = True
+        self.request._cart_cookie = self
+
+    def clear(self):
+        self.save({}, (0, 0))
+
+    def apply(self, response):
+        if not self._dirty:
+            return
+        if self._cart:
+            response.set_cookie(
+                _cookie_name(),
+                self.encode(self._cart, self._counts),
+                max_age=_cookie_age(),
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite='Lax',
+            )
+        elif _cookie_name() in self.request.COOKIES:
+            response.delete_cookie(_cookie_name(), samesite='Lax')
+
+
+def get_storage(request):
+    storage = getattr(request, '_cart_storage', None)
+    if storage is not None:
+        return storage
+
+    user = getattr(request, 'user', None)
+    use_cookie = getattr(settings, 'CART_STORAGE', 'session') == 'cookie'
+    if use_cookie and not (user is not None and user.is_authenticated):
+        storage = CookieCartStorage(request)
+    else:
+        storage = SessionCartStorage(request)
+
+    request._cart_storage = storage
+    return storage
+
+
+def merge_cookie_cart(sender, request, user, **kwargs):
+    if request is None:
+        return
+
+    cookie_storage = CookieCartStorage(request)
+    cookie_cart = cookie_storage.load()
+    if not cookie_cart:
+        return
+
+    session_storage = SessionCartStorage(request)
+    cart = session_storage.load()
+    for key, qty in cookie_cart.items():
+        try:
+            cart[key] = int(cart.get(key, 0)) + int(qty)
+        except (TypeError, ValueError):
+            continue
+    session_storage.save(cart)
+    cookie_storage.clear()
+
+    request._cart_storage = session_storage
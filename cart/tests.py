@@ -0,0 +1,100 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from catalog.models import Category, Product, ProductSize
+
+from .utils import CartResolver
+
+
+@override_settings(CART_STORAGE='cookie')
+class CartQueryCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name='Shoes', slug='shoes')
+        self.product = Product.objects.create(category=category, name='Runner', slug='runner', price=10)
+        self.size = ProductSize.objects.create(product=self.product, label='M', sort_order=0)
+        self.client.post(reverse('cart:add', args=[self.product.id]))
+
+    def test_add_to_cart_is_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.post(reverse('cart:add', args=[self.product.id]), {'size_id': self.size.id})
+        self.assertRedirects(response, reverse('cart:detail'), fetch_redirect_response=False)
+
+    def test_set_quantity_is_one_query(self):
+        key = f"{self.product.id}:{self.size.id}"
+        with self.assertNumQueries(1):
+            self.client.post(reverse('cart:set_quantity', args=[key]), {'quantity': 4})
+
+        response = self.client.get(reverse('cart:detail'))
+        self.assertEqual([(item['key'], item['quantity']) for item in response.context['items']], [(key, 4)])
+
+
+class CartStorageWriteTests(TestCase):
+    expected_writes = {
+        'cookie': {'add': 0, 'set_quantity': 0, 'remove': 0, 'view': 0},
+        'session': {'add': 1, 'set_quantity': 1, 'remove': 1, 'view': 0},
+    }
+
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name='Shoes', slug='shoes')
+        self.product = Product.objects.create(category=category, name='Runner', slug='runner', price=10)
+        self.key = f"{self.product.id}:0"
+
+    def _writes(self, method, url, data=None):
+        with CaptureQueriesContext(connection) as ctx:
+            getattr(self.client, method)(url, data or {})
+        return sum(1 for q in ctx.captured_queries if q['sql'].split(' ', 1)[0] in ('INSERT', 'UPDATE', 'DELETE'))
+
+    def _measure(self):
+        self.client.post(reverse('cart:add', args=[self.product.id]))
+        return {
+            'add': self._writes('post', reverse('cart:add', args=[self.product.id])),
+            'set_quantity': self._writes('post', reverse('cart:set_quantity', args=[self.key]), {'quantity': 3}),
+            'view': self._writes('get', reverse('cart:detail')),
+            'remove': self._writes('post', reverse('cart:remove', args=[self.key])),
+        }
+
+    def test_writes_per_operation(self):
+        for backend, expected in self.expected_writes.items():
+            with self.subTest(backend=backend), self.settings(CART_STORAGE=backend):
+                self.client = self.client_class()
+                self.assertEqual(self._measure(), expected)
+
+
+@override_settings(CART_STORAGE='session')
+class CartResolverQueryCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name='Shoes', slug='shoes')
+        self.products = Product.objects.bulk_create(
+            [Product(category=category, name=f"Runner {i}", slug=f"runner-{i}", price=10) for i in range(500)]
+        )
+        ProductSize.objects.bulk_create(
+            [ProductSize(product=product, label=label) for product in self.products[:250] for label in ('M', 'L')]
+        )
+
+    def _cart(self, lines):
+        return {f"{product.id}:0": 1 for product in self.products[:lines]}
+
+    def test_resolution_is_two_queries_for_any_cart_size(self):
+        for lines in (1, 50, 500):
+            with self.subTest(lines=lines), self.assertNumQueries(2):
+                items, subtotal, _ = CartResolver(self._cart(lines)).resolve()
+            self.assertEqual(len(items), lines)
+            self.assertEqual(subtotal, 10 * lines)
+
+    def test_cart_page_query_count_is_constant(self):
+        counts = []
+        for lines in (1, 50, 500):
+            session = self.client.session
+            session['cart'] = self._cart(lines)
+            session.save()
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(reverse('cart:detail'))
+            self.assertEqual(len(response.context['items']), lines)
+            counts.append(len(ctx.captured_queries))
+        self.assertEqual(len(set(counts)), 1, counts)
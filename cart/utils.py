@@ -1,123 +1,160 @@
 from decimal import Decimal
 
+from django.db.models import Prefetch
+from django.http import Http404
+
+from catalog.cache import get_active_sizes
 from catalog.models import Product, ProductSize
 
-CART_SESSION_KEY = 'cart'
+from .storage import get_storage
 
 
 def get_cart(request):
-    cart = request.session.get(CART_SESSION_KEY)
-    if not isinstance(cart, dict):
-        cart = {}
-    return cart
-
+    return get_storage(request).load()
 
-def save_cart(request, cart):
-    request.session[CART_SESSION_KEY] = cart
-    request.session.modified = True
 
+def _forget_resolution(request):
+    request.__dict__.pop('_cart_resolution', None)
 
-def clear_cart(request):
-    request.session[CART_SESSION_KEY] = {}
-    request.session.modified = True
 
+def save_cart(request, cart):
+    _forget_resolution(request)
+    get_storage(request).save(cart)
 
-def get_cart_items(request):
-    cart = get_cart(request)
-
-    product_ids = []
-    size_ids = []
-    for key in cart.keys():
-        pid_part = key
-        size_part = '0'
-        if ':' in key:
-            pid_part, size_part = key.split(':', 1)
-
-        try:
-            pid_int = int(pid_part)
-        except Exception:
-            continue
-
-        try:
-            size_int = int(size_part)
-        except Exception:
-            size_int = 0
-
-        product_ids.append(pid_int)
-        if size_int > 0:
-            size_ids.append(size_int)
-
-    products = Product.objects.filter(id__in=product_ids, is_active=True)
-    products_by_id = {p.id: p for p in products}
-
-    sizes = ProductSize.objects.filter(product_id__in=product_ids, is_active=True).order_by('sort_order', 'label')
-    sizes_by_id = {s.id: s for s in sizes}
-    sizes_by_product_id = {}
-    for s in sizes:
-        sizes_by_product_id.setdefault(s.product_id, []).append(s)
-
-    items = []
-    subtotal = Decimal('0.00')
-    cleaned_cart = {}
-    items_by_key = {}
-
-    for key, qty in cart.items():
-        pid_part = key
-        size_part = '0'
-        if ':' in key:
-            pid_part, size_part = key.split(':', 1)
-
-        try:
-            pid_int = int(pid_part)
-        except Exception:
-            continue
-
-        try:
-            size_int = int(size_part)
-        except Exception:
-            size_int = 0
-
-        try:
-            qty_int = int(qty)
-        except Exception:
-            qty_int = 0
-
-        product = products_by_id.get(pid_int)
-        if not product:
-            continue
-
-        size = None
-        if size_int > 0:
-            size = sizes_by_id.get(size_int)
-            if not size or size.product_id != product.id:
-                size = None
-                size_int = 0
-
-        if size_int == 0:
-            default_sizes = sizes_by_product_id.get(product.id) or []
-            if default_sizes:
-                size = default_sizes[0]
-                size_int = size.id
-
-        if qty_int > 0:
-            item_key = f"{product.id}:{size_int}"
-            cleaned_cart[item_key] = int(cleaned_cart.get(item_key, 0)) + qty_int
 
+def clear_cart(request):
+    _forget_resolution(request)
+    get_storage(request).clear()
+
+
+def get_cart_counts(request):
+    return get_storage(request).counts()
+
+
+def set_cart_line(request, item_key, qty, *, add=False):
+    _forget_resolution(request)
+    storage = get_storage(request)
+    cart = storage.load()
+    total, lines = storage.counts()
+
+    try:
+        old_qty = max(0, int(cart.get(item_key, 0)))
+    except (TypeError, ValueError):
+        old_qty = 0
+
+    new_qty = old_qty + qty if add else qty
+    if new_qty > 0:
+        cart[item_key] = new_qty
+    else:
+        cart.pop(item_key, None)
+        new_qty = 0
+
+    total += new_qty - old_qty
+    lines += int(new_qty > 0) - int(old_qty > 0)
+    storage.save(cart, (total, lines))
+
+
+def remove_cart_line(request, item_key):
+    set_cart_line(request, item_key, 0)
+
+
+def parse_cart_key(key):
+    pid_part, _, size_part = str(key).partition(':')
+    try:
+        pid = int(pid_part)
+    except ValueError:
+        return None
+    try:
+        size_id = int(size_part or 0)
+    except ValueError:
+        size_id = 0
+    return pid, max(size_id, 0)
+
+
+def resolve_product_size(product_id, size_id):
+    if not Product.objects.filter(id=product_id, is_active=True).exists():
+        raise Http404('No Product matches the given query.')
+
+    size_ids = [sid for sid, _ in get_active_sizes(product_id)]
+    default_size_id = size_ids[0] if size_ids else 0
+    return product_id, (size_id if size_id in size_ids else 0), default_size_id
+
+
+class CartResolver:
+    def __init__(self, cart):
+        self.cart = cart
+        self.lines = []
+        for key, qty in cart.items():
+            parsed = parse_cart_key(key)
+            if parsed is None:
+                continue
+            try:
+                qty = int(qty)
+            except (TypeError, ValueError):
+                qty = 0
+            self.lines.append((parsed[0], parsed[1], qty))
+
+    def fetch_products(self):
+        product_ids = {pid for pid, _, _ in self.lines}
+        if not product_ids:
+            return {}
+        products = Product.objects.filter(id__in=product_ids, is_active=True).prefetch_related(
+            Prefetch('sizes', queryset=ProductSize.objects.filter(is_active=True), to_attr='active_sizes')
+        )
+        return {p.id: p for p in products}
+
+    def resolve(self):
+        products_by_id = self.fetch_products()
+
+        items_by_key = {}
+        cleaned_cart = {}
+        for pid, size_id, qty in self.lines:
+            product = products_by_id.get(pid)
+            if not product:
+                continue
+
+            sizes = product.active_sizes
+            size = None
+            if size_id:
+                size = next((s for s in sizes if s.id == size_id), None)
+            if size is None:
+                size = sizes[0] if sizes else None
+            size_id = size.id if size else 0
+
+            if qty <= 0:
+                continue
+
+            item_key = f"{pid}:{size_id}"
+            cleaned_cart[item_key] = cleaned_cart.get(item_key, 0) + qty
             existing = items_by_key.get(item_key)
             if existing:
-                existing['quantity'] += qty_int
+                existing['quantity'] += qty
             else:
-                items_by_key[item_key] = {'product': product, 'size': size, 'size_id': size_int, 'quantity': qty_int}
+                items_by_key[item_key] = {'product': product, 'size': size, 'size_id': size_id, 'quantity': qty}
+
+        items = []
+        subtotal = Decimal('0.00')
+        for item_key, item in items_by_key.items():
+            unit_price = item['product'].selling_price
+            line_total = unit_price * item['quantity']
+            subtotal += line_total
+            item['unit_price'] = unit_price
+            item['line_total'] = line_total
+            item['key'] = item_key
+            items.append(item)
+
+        return items, subtotal, cleaned_cart
 
-    for item_key, item in items_by_key.items():
-        unit_price = item['product'].selling_price
-        line_total = unit_price * item['quantity']
-        subtotal += line_total
-        item['line_total'] = line_total
-        item['key'] = item_key
-        items.append(item)
 
+def get_cart_items(request):
+    resolution = request.__dict__.get('_cart_resolution')
+    if resolution is not None:
+        return resolution
+
+    cart = get_cart(request)
+    items, subtotal, cleaned_cart = CartResolver(cart).resolve()
     if cleaned_cart != cart:
         save_cart(request, cleaned_cart)
 
+    request._cart_resolution = (items, subtotal)
     return items, subtotal
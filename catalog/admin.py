@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Category, Product, ProductReview, ProductSize
+from .models import Category, OutboxEmail, Product, ProductReview, ProductSize
 
 
 @admin.register(Category)
@@ -33,3 +33,11 @@ class ProductReviewAdmin(admin.ModelAdmin):
     list_editable = ('is_active',)
     list_filter = ('is_active', 'rating', 'created_at')
     search_fields = ('product__name', 'name', 'comment', 'user__username')
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('subject', 'body')
+    readonly_fields = ('attempts', 'last_error', 'created_at', 'sent_at')
@@ -1,6 +1,30 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class CatalogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'catalog'
+
+    def ready(self):
+        from . import cache, images, ratings, search
+        from .models import Category, Product, ProductReview, ProductSize
+
+        post_save.connect(images.on_product_saved, sender=Product, dispatch_uid='catalog.images.product_saved')
+        post_save.connect(search.on_product_saved, sender=Product, dispatch_uid='catalog.search.product_saved')
+        post_delete.connect(search.on_product_deleted, sender=Product, dispatch_uid='catalog.search.product_deleted')
+        post_save.connect(search.on_category_saved, sender=Category, dispatch_uid='catalog.search.category_saved')
+
+        post_save.connect(cache.on_product_changed, sender=Product, dispatch_uid='catalog.cache.product_saved')
+        post_delete.connect(cache.on_product_deleted, sender=Product, dispatch_uid='catalog.cache.product_deleted')
+        post_save.connect(cache.on_category_changed, sender=Category, dispatch_uid='catalog.cache.category_saved')
+        post_delete.connect(cache.on_category_changed, sender=Category, dispatch_uid='catalog.cache.category_deleted')
+        post_save.connect(cache.on_product_detail_changed, sender=ProductSize, dispatch_uid='catalog.cache.size_saved')
+        post_delete.connect(cache.on_product_detail_changed, sender=ProductSize, dispatch_uid='catalog.cache.size_deleted')
+        post_save.connect(cache.on_size_changed, sender=ProductSize, dispatch_uid='catalog.cache.sizes_saved')
+        post_delete.connect(cache.on_size_changed, sender=ProductSize, dispatch_uid='catalog.cache.sizes_deleted')
+
+        post_save.connect(ratings.on_review_saved, sender=ProductReview, dispatch_uid='catalog.ratings.review_saved')
+        post_delete.connect(ratings.on_review_deleted, sender=ProductReview, dispatch_uid='catalog.ratings.review_deleted')
+        post_save.connect(cache.on_review_changed, sender=ProductReview, dispatch_uid='catalog.cache.review_saved')
+        post_delete.connect(cache.on_review_changed, sender=ProductReview, dispatch_uid='catalog.cache.review_deleted')
@@ -0,0 +1,155 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+CATEGORIES_SCOPE = 'categories'
+PRODUCTS_SCOPE = 'products'
+
+
+def get_cache():
+    return caches[getattr(settings, 'CATALOG_CACHE_ALIAS', 'default')]
+
+
+def _timeout():
+    return getattr(settings, 'CATALOG_CACHE_TIMEOUT', 600)
+
+
+def category_scope(slug):
+    return f"category:{slug}"
+
+
+def product_scope(slug):
+    return f"product:{slug}"
+
+
+def _version_key(scope):
+    return f"catalog:v:{scope}"
+
+
+def get_versions(scopes):
+    cache = get_cache()
+    keys = [_version_key(s) for s in scopes]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        version = found.get(key)
+        if version is None:
+            cache.add(key, time.time_ns(), None)
+            version = cache.get(key)
+        versions.append(str(version))
+    return versions
+
+
+def bump(*scopes):
+    cache = get_cache()
+    for scope in {s for s in scopes if s}:
+        key = _version_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def cached(name, parts, scopes, builder):
+    cache = get_cache()
+    digest = hashlib.md5(repr((parts, get_versions(scopes))).encode('utf-8')).hexdigest()
+    key = f"catalog:page:{name}:{digest}"
+
+    value = cache.get(key)
+    if value is None:
+        value = builder()
+        cache.set(key, value, _timeout())
+    return value
+
+
+def _sizes_key(product_id):
+    return f"catalog:sizes:{product_id}"
+
+
+def get_active_sizes(product_id):
+    cache = get_cache()
+    sizes = cache.get(_sizes_key(product_id))
+    if sizes is None:
+        from .models import ProductSize
+
+        sizes = list(
+            ProductSize.objects.filter(product_id=product_id, is_active=True)
+            .order_by('sort_order', 'label')
+            .values_list('id', 'label')
+        )
+        cache.set(_sizes_key(product_id), sizes, _timeout())
+    return sizes
+
+
+def list_scopes(category_slug=None):
+    if category_slug:
+        return [CATEGORIES_SCOPE, category_scope(category_slug)]
+    return [CATEGORIES_SCOPE, PRODUCTS_SCOPE]
+
+
+def product_scopes(product_id):
+    from .models import Product
+
+    row = Product.objects.filter(pk=product_id).values_list('slug', 'category__slug').first()
+    if not row:
+        return []
+    slug, category_slug = row
+    return [product_scope(slug), category_scope(category_slug)]
+
+
+def _category_slugs(instance, category_ids):
+    from .models import Category, Product
+
+    slugs = []
+    category_field = Product._meta.get_field('category')
+    if category_field.is_cached(instance) and instance.category is not None:
+        slugs.append(instance.category.slug)
+        category_ids = category_ids - {instance.category.pk}
+    if category_ids:
+        slugs.extend(Category.objects.filter(pk__in=category_ids).values_list('slug', flat=True))
+    return slugs
+
+
+def on_product_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    old_slug, old_category_id = getattr(instance, '_loaded_scope', (None, None))
+    category_ids = {pk for pk in (old_category_id, instance.category_id) if pk}
+    scopes = [product_scope(slug) for slug in {old_slug, instance.slug} if slug]
+    scopes += [category_scope(slug) for slug in _category_slugs(instance, category_ids)]
+    bump(PRODUCTS_SCOPE, *scopes)
+    instance._loaded_scope = (instance.slug, instance.category_id)
+
+
+def on_product_deleted(sender, instance, **kwargs):
+    from .models import Category
+
+    category_slug = Category.objects.filter(pk=instance.category_id).values_list('slug', flat=True).first()
+    bump(PRODUCTS_SCOPE, product_scope(instance.slug), category_scope(category_slug))
+
+
+def on_size_changed(sender, instance, **kwargs):
+    get_cache().delete(_sizes_key(instance.product_id))
+
+
+def on_product_detail_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from .models import Product
+
+    slug = Product.objects.filter(pk=instance.product_id).values_list('slug', flat=True).first()
+    bump(product_scope(slug) if slug else None)
+
+
+def on_review_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    bump(PRODUCTS_SCOPE, *product_scopes(instance.product_id))
+
+
+def on_category_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    bump(CATEGORIES_SCOPE, category_scope(instance.slug))
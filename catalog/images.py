@@ -0,0 +1,137 @@
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+
+from . import cache as catalog_cache
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='image-variants')
+
+IMAGE_FIELDS = ('image', 'image2', 'image3', 'image4')
+VARIANT_WIDTHS = (200, 400, 800)
+VARIANT_FORMATS = (
+    ('webp', 'WEBP', {'quality': 80, 'method': 4}),
+    ('jpg', 'JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+)
+
+
+def _variant_name(source_name, width, ext):
+    root, _ = posixpath.splitext(source_name)
+    return f"{root}_w{width}.{ext}"
+
+
+def _delete_variants(entry):
+    for _, _, name in (entry or {}).get('variants', []):
+        try:
+            default_storage.delete(name)
+        except Exception:
+            logger.warning('Could not delete image variant %s', name, exc_info=True)
+
+
+def build_variants(source_name):
+    from PIL import Image, ImageOps
+
+    with default_storage.open(source_name, 'rb') as fh:
+        original = Image.open(fh)
+        original = ImageOps.exif_transpose(original)
+        original.load()
+
+    if original.mode not in ('RGB', 'L'):
+        background = Image.new('RGB', original.size, (255, 255, 255))
+        rgba = original.convert('RGBA')
+        background.paste(rgba, mask=rgba.split()[-1])
+        original = background
+    elif original.mode == 'L':
+        original = original.convert('RGB')
+
+    variants = []
+    for width in VARIANT_WIDTHS:
+        if width >= original.width:
+            continue
+        height = max(1, round(original.height * width / original.width))
+        resized = original.resize((width, height), Image.LANCZOS)
+        for ext, pil_format, options in VARIANT_FORMATS:
+            buffer = BytesIO()
+            resized.save(buffer, format=pil_format, **options)
+            name = _variant_name(source_name, width, ext)
+            if default_storage.exists(name):
+                default_storage.delete(name)
+            name = default_storage.save(name, ContentFile(buffer.getvalue()))
+            variants.append([width, ext, name])
+    return original.width, variants
+
+
+def refresh_product_variants(product, force=False):
+    current = dict(product.image_variants or {})
+    updated = {}
+
+    for field_name in IMAGE_FIELDS:
+        field_file = getattr(product, field_name)
+        entry = current.get(field_name)
+        if not field_file:
+            if entry:
+                _delete_variants(entry)
+            continue
+
+        if entry and entry.get('src') == field_file.name and not force:
+            updated[field_name] = entry
+            continue
+
+        if entry:
+            _delete_variants(entry)
+        try:
+            width, variants = build_variants(field_file.name)
+            updated[field_name] = {'src': field_file.name, 'width': width, 'variants': variants}
+        except Exception:
+            logger.warning('Could not build variants for %s', field_file.name, exc_info=True)
+
+    if updated != current:
+        type(product).objects.filter(pk=product.pk).update(image_variants=updated)
+        product.image_variants = updated
+        catalog_cache.bump(catalog_cache.PRODUCTS_SCOPE, *catalog_cache.product_scopes(product.pk))
+        return True
+    return False
+
+
+def needs_refresh(product):
+    current = product.image_variants or {}
+    for field_name in IMAGE_FIELDS:
+        field_file = getattr(product, field_name)
+        entry = current.get(field_name)
+        if (entry.get('src') if entry else None) != (field_file.name if field_file else None):
+            return True
+    return False
+
+
+def _refresh(product_id):
+    from .models import Product
+
+    product = Product.objects.filter(pk=product_id).first()
+    if product is not None:
+        refresh_product_variants(product)
+
+
+def _refresh_in_background(product_id):
+    try:
+        _refresh(product_id)
+    except Exception:
+        logger.exception('Image variant refresh failed for product %s', product_id)
+    finally:
+        close_old_connections()
+
+
+def on_product_saved(sender, instance, raw=False, **kwargs):
+    if raw or not needs_refresh(instance):
+        return
+    product_id = instance.pk
+    if getattr(settings, 'IMAGE_VARIANTS_IN_BACKGROUND', True):
+        transaction.on_commit(lambda: _executor.submit(_refresh_in_background, product_id))
+    else:
+        transaction.on_commit(lambda: _refresh(product_id))
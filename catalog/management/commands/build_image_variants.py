@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from catalog.images import IMAGE_FIELDS, refresh_product_variants
+from catalog.models import Product
+
+
+class Command(BaseCommand):
+    help = 'Generate resized WebP/JPEG variants for product images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Rebuild variants that already exist.')
+
+    def handle(self, *args, **options):
+        has_image = Q()
+        for field_name in IMAGE_FIELDS:
+            has_image |= Q(**{f"{field_name}__gt": ''})
+
+        products = Product.objects.filter(has_image).only('id', 'image_variants', *IMAGE_FIELDS).order_by('id')
+
+        updated = 0
+        for product in products.iterator(chunk_size=100):
+            if refresh_product_variants(product, force=options['force']):
+                updated += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Updated image variants for {updated} product(s)."))
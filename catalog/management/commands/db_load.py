@@ -0,0 +1,91 @@
+import random
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, transaction
+from django.db.models import F
+
+from catalog.models import Category, Product
+
+LOAD_SLUG = 'db-load'
+
+
+class Command(BaseCommand):
+    help = (
+        'Run concurrent catalog reads and stock updates against the configured database and report throughput. '
+        'Compare profiles by re-running with different DJANGO_DB_* / DJANGO_SQLITE_* settings.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--ops', type=int, default=200, help='Operations per thread.')
+        parser.add_argument('--write-ratio', type=float, default=0.3)
+        parser.add_argument('--products', type=int, default=20)
+
+    def _profile(self):
+        if connection.vendor != 'sqlite':
+            return connection.vendor
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            journal_mode = cursor.fetchone()[0]
+            cursor.execute('PRAGMA synchronous')
+            synchronous = cursor.fetchone()[0]
+        return f"sqlite journal_mode={journal_mode} synchronous={synchronous}"
+
+    def _setup(self, count):
+        category, _ = Category.objects.get_or_create(slug=LOAD_SLUG, defaults={'name': 'DB load', 'is_active': False})
+        Product.objects.filter(category=category).delete()
+        Product.objects.bulk_create(
+            [
+                Product(category=category, name=f"Load {i}", slug=f"{LOAD_SLUG}-{i}", price=10, stock=10**6)
+                for i in range(count)
+            ]
+        )
+        return category, list(Product.objects.filter(category=category).values_list('id', flat=True))
+
+    def handle(self, *args, **options):
+        category, product_ids = self._setup(max(1, options['products']))
+        profile = self._profile()
+        counts = {'reads': 0, 'writes': 0, 'errors': 0}
+        lock = threading.Lock()
+        barrier = threading.Barrier(options['threads'])
+
+        def worker():
+            rng = random.Random()
+            done = {'reads': 0, 'writes': 0, 'errors': 0}
+            barrier.wait()
+            try:
+                for _ in range(options['ops']):
+                    try:
+                        if rng.random() < options['write_ratio']:
+                            with transaction.atomic():
+                                Product.objects.filter(pk=rng.choice(product_ids)).update(stock=F('stock') - 1)
+                            done['writes'] += 1
+                        else:
+                            list(Product.objects.filter(category=category).only('id', 'name', 'price', 'stock')[:24])
+                            done['reads'] += 1
+                    except OperationalError:
+                        done['errors'] += 1
+            finally:
+                connection.close()
+            with lock:
+                for key, value in done.items():
+                    counts[key] += value
+
+        threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        Product.objects.filter(category=category).delete()
+        category.delete()
+
+        ops = counts['reads'] + counts['writes']
+        self.stdout.write(
+            f"{profile}: {ops} ops in {elapsed:.2f}s ({ops / elapsed:.0f} ops/s), "
+            f"{counts['reads']} reads, {counts['writes']} writes, {counts['errors']} lock error(s)"
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from catalog.ratings import rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = 'Recompute denormalized rating counts and histograms from active reviews.'
+
+    def handle(self, *args, **options):
+        changed = rebuild_ratings()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt ratings for {changed} product(s)."))
@@ -0,0 +1,101 @@
+import json
+import threading
+import time
+from urllib.error import HTTPError, URLError
+from urllib.parse import urljoin
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_TRAFFIC = [
+    {'method': 'GET', 'path': '/'},
+    {'method': 'GET', 'path': '/?q=shirt'},
+    {'method': 'GET', 'path': '/contact/'},
+    {'method': 'GET', 'path': '/cart/'},
+]
+
+
+def load_traffic(path):
+    if not path:
+        return DEFAULT_TRAFFIC
+    entries = []
+    with open(path, encoding='utf-8') as fh:
+        for number, line in enumerate(fh, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError as exc:
+                raise CommandError(f"{path}:{number}: {exc}") from exc
+            if 'path' not in entry:
+                raise CommandError(f"{path}:{number}: missing 'path'")
+            entries.append({'method': entry.get('method', 'GET').upper(), 'path': entry['path']})
+    if not entries:
+        raise CommandError(f"{path} has no requests")
+    return entries
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Command(BaseCommand):
+    help = (
+        'Replay JSONL traffic ({"method": "GET", "path": "/"} per line) against a running server and report '
+        'throughput and latency. Start gunicorn in each DJANGO_SERVE_MODE and replay the same file to compare.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--traffic', default='', help='JSONL file of requests; a built-in page mix by default.')
+        parser.add_argument('--clients', type=int, default=16)
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds to replay for.')
+        parser.add_argument('--timeout', type=float, default=30.0)
+
+    def handle(self, *args, **options):
+        traffic = load_traffic(options['traffic'])
+        deadline = time.perf_counter() + options['duration']
+        latencies = []
+        errors = []
+        lock = threading.Lock()
+
+        def client(offset):
+            index = offset
+            done, failed = [], 0
+            while time.perf_counter() < deadline:
+                entry = traffic[index % len(traffic)]
+                index += 1
+                request = Request(urljoin(options['base_url'], entry['path']), method=entry['method'])
+                started = time.perf_counter()
+                try:
+                    with urlopen(request, timeout=options['timeout']) as response:
+                        response.read()
+                except HTTPError as exc:
+                    if exc.code >= 500:
+                        failed += 1
+                        continue
+                except (URLError, OSError):
+                    failed += 1
+                    continue
+                done.append(time.perf_counter() - started)
+            with lock:
+                latencies.extend(done)
+                errors.append(failed)
+
+        threads = [threading.Thread(target=client, args=(n,)) for n in range(max(1, options['clients']))]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"{len(latencies)} requests in {elapsed:.2f}s ({len(latencies) / elapsed:.1f} req/s), "
+            f"p50 {percentile(latencies, 0.5) * 1000:.0f}ms, p95 {percentile(latencies, 0.95) * 1000:.0f}ms, "
+            f"{sum(errors)} error(s)"
+        )
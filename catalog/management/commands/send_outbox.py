@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from catalog.outbox import send_pending
+
+
+class Command(BaseCommand):
+    help = 'Send queued outbox emails in batches over a reused connection.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new mail.')
+        parser.add_argument('--interval', type=float, default=10.0, help='Seconds between polls with --loop.')
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                sent = send_pending(batch_size=options['batch_size'])
+            except Exception as exc:
+                if not options['loop']:
+                    raise
+                self.stderr.write(f"Outbox drain failed: {exc}")
+                close_old_connections()
+                sent = 0
+            if sent:
+                self.stdout.write(f"Sent {sent} email(s).")
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
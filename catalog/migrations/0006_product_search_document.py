@@ -0,0 +1,67 @@
+# Generated by Django 4.2.27 on 2026-10-18 15:30
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS catalog_product_search_gin ON catalog_product USING gin (search_document)'
+        )
+        schema_editor.execute(
+            """
+            UPDATE catalog_product AS p
+            SET search_document =
+                setweight(to_tsvector('english', coalesce(p.name, '')), 'A')
+                || setweight(to_tsvector('english', coalesce(c.name, '')), 'B')
+                || setweight(to_tsvector('english', coalesce(p.description, '')), 'C')
+            FROM catalog_category AS c
+            WHERE c.id = p.category_id
+            """
+        )
+        return
+
+    if connection.vendor == 'sqlite':
+        try:
+            schema_editor.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS catalog_product_fts "
+                "USING fts5(name, description, category, tokenize='porter unicode61')"
+            )
+        except Exception:
+            return
+        schema_editor.execute(
+            """
+            INSERT INTO catalog_product_fts (rowid, name, description, category)
+            SELECT p.id, p.name, coalesce(p.description, ''), coalesce(c.name, '')
+            FROM catalog_product AS p
+            JOIN catalog_category AS c ON c.id = p.category_id
+            """
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+
+    if connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS catalog_product_search_gin')
+    elif connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS catalog_product_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0005_product_created_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_document',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
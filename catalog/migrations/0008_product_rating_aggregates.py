@@ -0,0 +1,71 @@
+# Generated by Django 4.2.27 on 2026-10-18 15:37
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_ratings(apps, schema_editor):
+    Product = apps.get_model('catalog', 'Product')
+    ProductReview = apps.get_model('catalog', 'ProductReview')
+
+    totals = {}
+    rows = (
+        ProductReview.objects.filter(is_active=True, rating__in=range(1, 6))
+        .values('product_id', 'rating')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    for row in rows:
+        totals.setdefault(row['product_id'], {})[row['rating']] = row['total']
+
+    for product_id, histogram in totals.items():
+        values = {f"rating_{i}": histogram.get(i, 0) for i in range(1, 6)}
+        values['rating_count'] = sum(histogram.values())
+        values['rating_sum'] = sum(rating * count for rating, count in histogram.items())
+        Product.objects.filter(pk=product_id).update(**values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0007_product_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='rating_1',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_2',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_3',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_4',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_5',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_ratings, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,144 @@
+import logging
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='outbox')
+_wakeup_lock = threading.Lock()
+_wakeup = None
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def enqueue_email(*, subject, body, to, from_email='', reply_to=None):
+    email = OutboxEmail.objects.create(
+        subject=subject[:255],
+        body=body,
+        from_email=from_email or '',
+        to=list(to),
+        reply_to=list(reply_to or []),
+    )
+    if _setting('OUTBOX_SEND_IN_BACKGROUND', True):
+        transaction.on_commit(lambda: _executor.submit(_drain_in_background))
+    return email
+
+
+def _drain_in_background():
+    try:
+        send_pending()
+        _schedule_wakeup()
+    except Exception:
+        logger.exception('Outbox drain failed')
+    finally:
+        close_old_connections()
+
+
+def _schedule_wakeup():
+    global _wakeup
+
+    next_due = OutboxEmail.objects.filter(status=OutboxEmail.Status.PENDING).aggregate(due=Min('next_attempt_at'))['due']
+    if next_due is None:
+        return
+    delay = max(1.0, (next_due - timezone.now()).total_seconds())
+
+    with _wakeup_lock:
+        if _wakeup is not None:
+            _wakeup.cancel()
+        _wakeup = threading.Timer(delay, _executor.submit, args=(_drain_in_background,))
+        _wakeup.daemon = True
+        _wakeup.start()
+
+
+def _lease(now, lease_seconds):
+    return now + timedelta(seconds=lease_seconds, microseconds=secrets.randbelow(1_000_000))
+
+
+def _claim_batch(batch_size, lease_seconds):
+    now = timezone.now()
+    due = OutboxEmail.objects.filter(status=OutboxEmail.Status.PENDING, next_attempt_at__lte=now)
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            emails = list(due.select_for_update(skip_locked=True).order_by('next_attempt_at', 'id')[:batch_size])
+            if emails:
+                lease = _lease(now, lease_seconds)
+                OutboxEmail.objects.filter(id__in=[e.id for e in emails]).update(next_attempt_at=lease)
+        return emails
+
+    # Without row locks, claim with a conditional UPDATE and read back the rows carrying this drainer's lease.
+    ids = list(due.order_by('next_attempt_at', 'id').values_list('id', flat=True)[:batch_size])
+    if not ids:
+        return []
+    lease = _lease(now, lease_seconds)
+    if not due.filter(id__in=ids).update(next_attempt_at=lease):
+        return []
+    return list(OutboxEmail.objects.filter(id__in=ids, next_attempt_at=lease).order_by('id'))
+
+
+def _open_connection():
+    mail_connection = get_connection(fail_silently=False)
+    try:
+        mail_connection.open()
+    except Exception as exc:
+        logger.warning('Could not open mail connection: %s', exc)
+        return None
+    return mail_connection
+
+
+def send_pending(batch_size=None):
+    batch_size = batch_size or _setting('OUTBOX_BATCH_SIZE', 50)
+    max_attempts = _setting('OUTBOX_MAX_ATTEMPTS', 5)
+    backoff = _setting('OUTBOX_RETRY_BACKOFF', 60)
+
+    emails = _claim_batch(batch_size, lease_seconds=_setting('OUTBOX_LEASE_SECONDS', 300))
+    if not emails:
+        return 0
+
+    mail_connection = _open_connection()
+    now = timezone.now()
+    sent = 0
+    for email in emails:
+        email.attempts += 1
+        try:
+            if mail_connection is None:
+                raise RuntimeError('Mail connection unavailable')
+            EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                from_email=email.from_email or None,
+                to=email.to,
+                reply_to=email.reply_to,
+                connection=mail_connection,
+            ).send(fail_silently=False)
+        except Exception as exc:
+            email.last_error = str(exc)[:2000]
+            if email.attempts >= max_attempts:
+                email.status = OutboxEmail.Status.FAILED
+            else:
+                email.next_attempt_at = now + timedelta(seconds=backoff * 2 ** (email.attempts - 1))
+        else:
+            email.status = OutboxEmail.Status.SENT
+            email.sent_at = now
+            email.last_error = ''
+            sent += 1
+
+    if mail_connection is not None:
+        try:
+            mail_connection.close()
+        except Exception:
+            logger.warning('Could not close mail connection', exc_info=True)
+
+    OutboxEmail.objects.bulk_update(emails, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'])
+    return sent
@@ -0,0 +1,139 @@
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q
+
+CURSOR_NEXT = 'n'
+CURSOR_PREV = 'p'
+CURSOR_OFFSET = 'o'
+
+MAX_PAGE_SIZE = 100
+
+
+def page_url(request, cursor):
+    if not cursor:
+        return None
+    params = request.GET.copy()
+    params['cursor'] = cursor
+    return f"{request.path}?{params.urlencode()}"
+
+
+def _encode(payload) -> str:
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _decode(token: str):
+    padded = token + '=' * (-len(token) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+
+
+def encode_cursor(direction: str, obj) -> str:
+    return _encode([direction, obj.created_at.isoformat(), obj.pk])
+
+
+def decode_cursor(token: str):
+    if not token:
+        return None
+    try:
+        direction, created_at, pk = _decode(token)
+        if direction not in {CURSOR_NEXT, CURSOR_PREV}:
+            return None
+        return direction, datetime.fromisoformat(created_at), int(pk)
+    except Exception:
+        return None
+
+
+def decode_offset_cursor(token: str) -> int:
+    if not token:
+        return 0
+    try:
+        kind, offset = _decode(token)
+        if kind != CURSOR_OFFSET:
+            return 0
+        return max(0, int(offset))
+    except Exception:
+        return 0
+
+
+class KeysetPage:
+    def __init__(self, object_list, *, next_cursor=None, prev_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.prev_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+class KeysetPaginator:
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = max(1, min(int(per_page), MAX_PAGE_SIZE))
+
+    def page(self, token=None):
+        cursor = decode_cursor(token)
+        if cursor is None:
+            rows = list(self.queryset.order_by('-created_at', '-id')[: self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[: self.per_page]
+            return self._build(rows, has_next=has_more, has_previous=False)
+
+        direction, created_at, pk = cursor
+        if direction == CURSOR_NEXT:
+            qs = self.queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+            rows = list(qs.order_by('-created_at', '-id')[: self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[: self.per_page]
+            return self._build(rows, has_next=has_more, has_previous=True)
+
+        qs = self.queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+        rows = list(qs.order_by('created_at', 'id')[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        rows.reverse()
+        return self._build(rows, has_next=True, has_previous=has_more)
+
+    def _build(self, rows, *, has_next, has_previous):
+        if not rows:
+            return KeysetPage(rows)
+        return KeysetPage(
+            rows,
+            next_cursor=encode_cursor(CURSOR_NEXT, rows[-1]) if has_next else None,
+            prev_cursor=encode_cursor(CURSOR_PREV, rows[0]) if has_previous else None,
+        )
+
+
+class RankedPaginator:
+    def __init__(self, queryset, per_page, max_pages=50):
+        self.queryset = queryset
+        self.per_page = max(1, min(int(per_page), MAX_PAGE_SIZE))
+        self.max_offset = self.per_page * (max(1, int(max_pages)) - 1)
+
+    def page(self, token=None):
+        offset = min(decode_offset_cursor(token), self.max_offset)
+        rows = list(self.queryset[offset : offset + self.per_page + 1])
+        has_more = len(rows) > self.per_page and offset + self.per_page <= self.max_offset
+        rows = rows[: self.per_page]
+
+        next_cursor = _encode([CURSOR_OFFSET, offset + self.per_page]) if has_more else None
+        prev_cursor = None
+        if offset > 0:
+            prev_cursor = _encode([CURSOR_OFFSET, max(0, offset - self.per_page)])
+        return KeysetPage(rows, next_cursor=next_cursor, prev_cursor=prev_cursor)
@@ -0,0 +1,70 @@
+from django.db.models import Count, F
+
+RATING_VALUES = range(1, 6)
+
+
+def _contribution(product_id, rating, is_active):
+    if not product_id or not is_active or rating not in RATING_VALUES:
+        return None
+    return product_id, rating
+
+
+def apply_rating_delta(product_id, rating, delta):
+    from .models import Product
+
+    Product.objects.filter(pk=product_id).update(
+        rating_count=F('rating_count') + delta,
+        rating_sum=F('rating_sum') + delta * rating,
+        **{f"rating_{rating}": F(f"rating_{rating}") + delta},
+    )
+
+
+def on_review_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    old = _contribution(*getattr(instance, '_loaded_rating', (None, None, None)))
+    new = _contribution(instance.product_id, instance.rating, instance.is_active)
+    instance._loaded_rating = (instance.product_id, instance.rating, instance.is_active)
+    if old == new:
+        return
+    if old:
+        apply_rating_delta(*old, -1)
+    if new:
+        apply_rating_delta(*new, 1)
+
+
+def on_review_deleted(sender, instance, **kwargs):
+    old = _contribution(*getattr(instance, '_loaded_rating', (None, None, None)))
+    if old:
+        apply_rating_delta(*old, -1)
+
+
+def rebuild_ratings():
+    from .models import Product, ProductReview
+
+    totals = {}
+    rows = (
+        ProductReview.objects.filter(is_active=True, rating__in=RATING_VALUES)
+        .values('product_id', 'rating')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    for row in rows:
+        totals.setdefault(row['product_id'], {})[row['rating']] = row['total']
+
+    fields = ['rating_count', 'rating_sum', *(f"rating_{i}" for i in RATING_VALUES)]
+    products = list(Product.objects.only('id', *fields))
+    changed = []
+    for product in products:
+        histogram = totals.get(product.id, {})
+        values = {f"rating_{i}": histogram.get(i, 0) for i in RATING_VALUES}
+        values['rating_count'] = sum(histogram.values())
+        values['rating_sum'] = sum(rating * count for rating, count in histogram.items())
+        if any(getattr(product, field) != value for field, value in values.items()):
+            for field, value in values.items():
+                setattr(product, field, value)
+            changed.append(product)
+
+    Product.objects.bulk_update(changed, fields, batch_size=500)
+    return len(changed)
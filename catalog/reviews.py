@@ -0,0 +1,77 @@
+import hashlib
+import time
+
+from django.conf import settings
+
+from . import cache as catalog_cache
+
+RATE_LIMITED = 'rate_limited'
+DUPLICATE = 'duplicate'
+ACCEPTED = 'accepted'
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def client_ident(request):
+    if request.user.is_authenticated:
+        return f"user:{request.user.pk}"
+    ip = request.META.get('REMOTE_ADDR', '')
+    trusted_proxies = _setting('TRUSTED_PROXY_COUNT', 0)
+    if trusted_proxies:
+        hops = [hop.strip() for hop in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if hop.strip()]
+        if len(hops) >= trusted_proxies:
+            ip = hops[-trusted_proxies]
+    return f"ip:{ip}"
+
+
+def take_token(ident):
+    capacity = max(1, _setting('REVIEW_RATE_BURST', 3))
+    per_hour = max(1, _setting('REVIEW_RATE_PER_HOUR', 10))
+    window = capacity * 3600 / per_hour
+    cache = catalog_cache.get_cache()
+    digest = hashlib.sha1(ident.encode('utf-8')).hexdigest()
+    key = f"catalog:reviews:bucket:{digest}:{int(time.time() // window)}"
+
+    cache.add(key, 0, int(window) + 1)
+    try:
+        spent = cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, int(window) + 1)
+        spent = 1
+    return spent <= capacity
+
+
+def content_hash(product_id, ident, rating, comment):
+    normalized = ' '.join((comment or '').lower().split())
+    raw = f"{product_id}|{rating}|{normalized}|{ident}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def submit_review(request, product, *, rating, name, comment):
+    from .models import ProductReview
+
+    ident = client_ident(request)
+    if not take_token(ident):
+        return RATE_LIMITED
+
+    digest = content_hash(product.id, ident, rating, comment)
+    dedupe_window = _setting('REVIEW_DEDUPE_WINDOW', 60 * 60 * 24)
+    seen_key = f"catalog:reviews:seen:{digest}"
+    if not catalog_cache.get_cache().add(seen_key, 1, dedupe_window):
+        return DUPLICATE
+
+    try:
+        ProductReview.objects.create(
+            product_id=product.id,
+            user=request.user if request.user.is_authenticated else None,
+            name=name,
+            rating=rating,
+            comment=comment,
+            is_active=True,
+        )
+    except Exception:
+        catalog_cache.get_cache().delete(seen_key)
+        raise
+    return ACCEPTED
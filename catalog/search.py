@@ -0,0 +1,130 @@
+import re
+
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+SEARCH_CONFIG = 'english'
+FTS_TABLE = 'catalog_product_fts'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+_fts_available = None
+
+
+def _tokens(query: str):
+    return _TOKEN_RE.findall((query or '').lower())[:12]
+
+
+def _is_postgres():
+    return connection.vendor == 'postgresql'
+
+
+def _sqlite_fts_available():
+    global _fts_available
+    if _fts_available is None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            _fts_available = cursor.fetchone() is not None
+    return _fts_available
+
+
+def _search_vector(category_name):
+    from django.contrib.postgres.search import SearchVector
+
+    return (
+        SearchVector(F('name'), weight='A', config=SEARCH_CONFIG)
+        + SearchVector(Value(category_name or ''), weight='B', config=SEARCH_CONFIG)
+        + SearchVector(F('description'), weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def index_products(products):
+    products = list(products)
+    if not products:
+        return
+
+    from .models import Category, Product
+
+    if _is_postgres():
+        by_category = {}
+        for product in products:
+            by_category.setdefault(product.category_id, []).append(product.pk)
+        names = dict(Category.objects.filter(id__in=by_category).values_list('id', 'name'))
+        for category_id, ids in by_category.items():
+            Product.objects.filter(id__in=ids).update(search_document=_search_vector(names.get(category_id)))
+        return
+
+    if connection.vendor != 'sqlite' or not _sqlite_fts_available():
+        return
+
+    rows = Product.objects.filter(id__in=[p.pk for p in products]).values_list('id', 'name', 'description', 'category__name')
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(p.pk,) for p in products])
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, name, description, category) VALUES (%s, %s, %s, %s)",
+            [(pid, name, description or '', category or '') for pid, name, description, category in rows],
+        )
+
+
+def unindex_products(product_ids):
+    product_ids = list(product_ids)
+    if not product_ids or connection.vendor != 'sqlite' or not _sqlite_fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(pid,) for pid in product_ids])
+
+
+def search_products(queryset, query: str):
+    tokens = _tokens(query)
+    if not tokens:
+        return queryset.none()
+
+    if _is_postgres():
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        search_query = SearchQuery(' & '.join(f"{t}:*" for t in tokens), search_type='raw', config=SEARCH_CONFIG)
+        return (
+            queryset.filter(search_document=search_query)
+            .annotate(search_rank=SearchRank(F('search_document'), search_query))
+            .order_by('-search_rank', '-created_at', '-id')
+        )
+
+    if connection.vendor == 'sqlite' and _sqlite_fts_available():
+        match = ' '.join(f'"{t}"*' for t in tokens)
+        return (
+            queryset.filter(id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]))
+            .annotate(
+                search_rank=RawSQL(
+                    f"SELECT -bm25({FTS_TABLE}, 10.0, 2.0, 4.0) FROM {FTS_TABLE} "
+                    f"WHERE {FTS_TABLE} MATCH %s AND rowid = catalog_product.id",
+                    [match],
+                    output_field=FloatField(),
+                )
+            )
+            .order_by('-search_rank', '-created_at', '-id')
+        )
+
+    condition = Q()
+    for token in tokens:
+        condition &= Q(name__icontains=token) | Q(description__icontains=token) | Q(category__name__icontains=token)
+    return (
+        queryset.filter(condition)
+        .annotate(search_rank=Value(0.0, output_field=FloatField()))
+        .order_by('-created_at', '-id')
+    )
+
+
+def on_product_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    index_products([instance])
+
+
+def on_product_deleted(sender, instance, **kwargs):
+    unindex_products([instance.pk])
+
+
+def on_category_saved(sender, instance, raw=False, created=False, **kwargs):
+    if raw or created:
+        return
+    index_products(instance.products.only('id', 'category_id'))
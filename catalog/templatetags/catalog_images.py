@@ -0,0 +1,51 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html, format_html_join
+
+register = template.Library()
+
+
+def _variant_entry(field_file):
+    instance = getattr(field_file, 'instance', None)
+    field = getattr(field_file, 'field', None)
+    if instance is None or field is None:
+        return None
+    entry = (getattr(instance, 'image_variants', None) or {}).get(field.name)
+    if not entry or entry.get('src') != field_file.name:
+        return None
+    return entry
+
+
+def _srcset(candidates):
+    return ', '.join(f"{url} {width}w" for width, url in candidates)
+
+
+@register.simple_tag
+def responsive_image(field_file, sizes='100vw', alt='', css_class='', loading='lazy'):
+    if not field_file:
+        return ''
+
+    entry = _variant_entry(field_file)
+    attrs = {'alt': alt, 'loading': loading}
+    if css_class:
+        attrs['class'] = css_class
+
+    if not entry or not entry.get('variants'):
+        attrs['src'] = field_file.url
+        return format_html('<img {}>', format_html_join(' ', '{}="{}"', attrs.items()))
+
+    webp = [(w, default_storage.url(name)) for w, ext, name in entry['variants'] if ext == 'webp']
+    jpeg = [(w, default_storage.url(name)) for w, ext, name in entry['variants'] if ext == 'jpg']
+    if entry.get('width'):
+        jpeg.append((entry['width'], field_file.url))
+
+    attrs['src'] = jpeg[0][1] if jpeg else field_file.url
+    attrs['srcset'] = _srcset(jpeg)
+    attrs['sizes'] = sizes
+
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}"><img {}></picture>',
+        _srcset(webp),
+        sizes,
+        format_html_join(' ', '{}="{}"', attrs.items()),
+    )
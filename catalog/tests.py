@@ -0,0 +1,445 @@
+import shutil
+import tempfile
+import threading
+from datetime import timedelta
+from io import BytesIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import connection
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import outbox, search
+from .models import Category, OutboxEmail, Product, ProductReview, ProductSize
+from .ratings import rebuild_ratings
+from .reviews import ACCEPTED, DUPLICATE, RATE_LIMITED, client_ident, submit_review, take_token
+from .search import search_products
+
+
+@override_settings(REVIEW_RATE_BURST=3, REVIEW_RATE_PER_HOUR=10)
+class ReviewSubmissionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name='Shoes', slug='shoes')
+        self.product = Product.objects.create(category=category, name='Runner', slug='runner', price=10)
+
+    def _request(self, user=None, **meta):
+        request = RequestFactory().post('/', REMOTE_ADDR='203.0.113.7', **meta)
+        request.user = user or AnonymousUser()
+        return request
+
+    def test_forwarded_for_does_not_bypass_rate_limit(self):
+        results = [
+            submit_review(
+                self._request(HTTP_X_FORWARDED_FOR=f"198.51.100.{i}"),
+                self.product,
+                rating=5,
+                name='Guest',
+                comment=f"Review {i}",
+            )
+            for i in range(6)
+        ]
+        self.assertEqual(results.count(ACCEPTED), 3)
+        self.assertEqual(results.count(RATE_LIMITED), 3)
+
+    def test_trusted_proxy_hop_identifies_client(self):
+        request = self._request(HTTP_X_FORWARDED_FOR='198.51.100.1, 192.0.2.44')
+        self.assertEqual(client_ident(request), 'ip:203.0.113.7')
+        with self.settings(TRUSTED_PROXY_COUNT=1):
+            self.assertEqual(client_ident(request), 'ip:192.0.2.44')
+
+    def test_same_comment_from_different_customers_is_kept(self):
+        User = get_user_model()
+        bob = User.objects.create_user('bob', password='secret')
+        alice = User.objects.create_user('alice', password='secret')
+
+        def post(user):
+            return submit_review(self._request(user), self.product, rating=5, name='', comment='Nice')
+
+        self.assertEqual(post(bob), ACCEPTED)
+        self.assertEqual(post(alice), ACCEPTED)
+        self.assertEqual(post(alice), DUPLICATE)
+        self.assertEqual(ProductReview.objects.filter(product=self.product).count(), 2)
+
+    def test_review_is_stored_before_it_is_acknowledged(self):
+        self.assertEqual(submit_review(self._request(), self.product, rating=4, name='Guest', comment='Good'), ACCEPTED)
+
+        self.assertTrue(ProductReview.objects.filter(product=self.product, comment='Good').exists())
+        self.assertEqual(Product.objects.get(pk=self.product.pk).rating_count, 1)
+
+    def test_failed_write_can_be_resubmitted(self):
+        def post():
+            return submit_review(self._request(), self.product, rating=4, name='Guest', comment='Good')
+
+        with mock.patch.object(ProductReview.objects, 'create', side_effect=RuntimeError('db down')):
+            with self.assertRaises(RuntimeError):
+                post()
+        self.assertEqual(post(), ACCEPTED)
+
+    def test_concurrent_requests_cannot_share_a_token(self):
+        barrier = threading.Barrier(12)
+        results = []
+        lock = threading.Lock()
+
+        def spend():
+            barrier.wait()
+            allowed = take_token('ip:203.0.113.7')
+            with lock:
+                results.append(allowed)
+
+        threads = [threading.Thread(target=spend) for _ in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results.count(True), 3)
+
+
+@override_settings(REVIEW_RATE_BURST=3, REVIEW_RATE_PER_HOUR=10)
+class ReviewSpamBurstTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name='Shoes', slug='shoes')
+        self.product = Product.objects.create(category=category, name='Runner', slug='runner', price=10)
+        self.url = reverse('catalog:product_review_create', kwargs={'slug': 'runner'})
+
+    def _burst(self, posts):
+        with CaptureQueriesContext(connection) as ctx:
+            for data, meta in posts:
+                self.client.post(self.url, data, **meta)
+        return [q['sql'] for q in ctx.captured_queries if q['sql'].split(' ', 1)[0] in ('INSERT', 'UPDATE', 'DELETE')]
+
+    def test_spam_burst_writes_are_bounded_by_the_rate_limit(self):
+        writes = self._burst(
+            [({'rating': 5, 'comment': f"spam {i}"}, {'REMOTE_ADDR': '203.0.113.7'}) for i in range(200)]
+        )
+        inserts = [sql for sql in writes if sql.startswith('INSERT INTO "catalog_productreview"')]
+
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(len(writes), 6)
+        self.assertEqual(ProductReview.objects.count(), 3)
+
+    def test_repeated_review_is_written_once(self):
+        writes = self._burst(
+            [({'rating': 5, 'comment': 'Great'}, {'REMOTE_ADDR': f"198.51.100.{i % 2}"}) for i in range(100)]
+        )
+
+        self.assertEqual(len([sql for sql in writes if 'catalog_productreview' in sql]), 2)
+        self.assertEqual(ProductReview.objects.count(), 2)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', OUTBOX_SEND_IN_BACKGROUND=False)
+class ContactOutboxTests(TestCase):
+    data = {'name': 'Asha', 'email': 'asha@example.com', 'issue_type': 'OTHER', 'message': 'Where is my parcel?'}
+
+    def _queue(self, count):
+        for n in range(count):
+            OutboxEmail.objects.create(subject=f"Mail {n}", body='Body', to=['shop@example.com'])
+
+    def test_contact_post_does_not_wait_for_smtp(self):
+        with mock.patch.object(EmailBackend, 'send_messages') as send_messages:
+            for _ in range(3):
+                response = self.client.post(reverse('catalog:contact_us'), self.data)
+
+        self.assertEqual(response.status_code, 302)
+        send_messages.assert_not_called()
+        self.assertEqual(OutboxEmail.objects.filter(status=OutboxEmail.Status.PENDING).count(), 3)
+
+        self.assertEqual(outbox.send_pending(), 3)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[0].reply_to, ['asha@example.com'])
+
+    def test_concurrent_drainers_do_not_claim_the_same_rows(self):
+        self._queue(3)
+        lease = outbox._lease
+        rival = []
+
+        def claim_in_between(now, lease_seconds):
+            if not rival:
+                rival.append(None)
+                rival[0] = outbox._claim_batch(10, 300)
+            return lease(now, lease_seconds)
+
+        with mock.patch.object(outbox, '_lease', side_effect=claim_in_between):
+            claimed = outbox._claim_batch(10, 300)
+
+        self.assertEqual(claimed, [])
+        self.assertEqual(len(rival[0]), 3)
+
+    def test_second_drain_sends_nothing_twice(self):
+        self._queue(2)
+        self.assertEqual(outbox.send_pending(), 2)
+        self.assertEqual(outbox.send_pending(), 0)
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_wakeup_is_scheduled_for_next_retry(self):
+        OutboxEmail.objects.create(
+            subject='Retry',
+            body='Body',
+            to=['shop@example.com'],
+            next_attempt_at=timezone.now() + timedelta(seconds=120),
+        )
+        with mock.patch.object(outbox.threading, 'Timer') as timer:
+            outbox._schedule_wakeup()
+
+        delay = timer.call_args.args[0]
+        self.assertGreater(delay, 100)
+        self.assertLessEqual(delay, 120)
+        timer.return_value.start.assert_called_once()
+
+
+class ProductSearchTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name='Footwear', slug='footwear')
+
+    def _product(self, name, description=''):
+        slug = name.lower().replace(' ', '-')
+        return Product.objects.create(category=self.category, name=name, slug=slug, description=description, price=10)
+
+    def _search(self, query):
+        return list(search_products(Product.objects.all(), query).values_list('name', flat=True))
+
+    def test_name_match_outranks_description_match(self):
+        self._product('Canvas Bag', description='Fits a pair of trail runners.')
+        self._product('Trail Runner')
+
+        self.assertEqual(self._search('runner'), ['Trail Runner', 'Canvas Bag'])
+        self.assertEqual(self._search('footwear'), ['Trail Runner', 'Canvas Bag'])
+        self.assertEqual(self._search('  '), [])
+
+    def test_index_follows_product_updates_and_deletes(self):
+        product = self._product('Leather Sandal')
+        self.assertEqual(self._search('sandal'), ['Leather Sandal'])
+
+        product.name = 'Leather Loafer'
+        product.save()
+        self.assertEqual(self._search('sandal'), [])
+        self.assertEqual(self._search('loaf'), ['Leather Loafer'])
+
+        product.delete()
+        self.assertEqual(self._search('loafer'), [])
+
+    def test_category_rename_reindexes_products(self):
+        self._product('Trail Runner')
+        self.category.name = 'Sneakers'
+        self.category.save()
+
+        self.assertEqual(self._search('sneakers'), ['Trail Runner'])
+        self.assertEqual(self._search('footwear'), [])
+
+    def test_sqlite_fts_rows_track_products(self):
+        if connection.vendor != 'sqlite' or not search._sqlite_fts_available():
+            self.skipTest('SQLite FTS5 index not available')
+
+        def fts_rows():
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT rowid, name FROM {search.FTS_TABLE} ORDER BY rowid")
+                return cursor.fetchall()
+
+        product = self._product('Trail Runner')
+        self.assertEqual(fts_rows(), [(product.pk, 'Trail Runner')])
+
+        product.name = 'Road Runner'
+        product.save()
+        self.assertEqual(fts_rows(), [(product.pk, 'Road Runner')])
+
+        product.delete()
+        self.assertEqual(fts_rows(), [])
+
+
+class CatalogCacheInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Shoes', slug='shoes')
+        self.other = Category.objects.create(name='Bags', slug='bags')
+        self.product = Product.objects.create(category=self.category, name='Runner', slug='runner', price=10)
+        self.urls = {
+            'list': reverse('catalog:product_list'),
+            'category': reverse('catalog:category', kwargs={'slug': 'shoes'}),
+            'detail': reverse('catalog:product_detail', kwargs={'slug': 'runner'}),
+        }
+
+    def _warm(self):
+        for url in self.urls.values():
+            self.client.get(url)
+
+    def test_warm_pages_skip_the_database(self):
+        self._warm()
+        for url in self.urls.values():
+            with self.assertNumQueries(0):
+                self.assertContains(self.client.get(url), 'Runner')
+
+    def test_product_edit_invalidates_list_category_and_detail(self):
+        self._warm()
+        self.product.name = 'Trail Runner'
+        self.product.save()
+
+        for url in self.urls.values():
+            self.assertContains(self.client.get(url), 'Trail Runner')
+
+    def test_product_save_looks_up_category_slugs_once(self):
+        product = Product.objects.get(pk=self.product.pk)
+        with CaptureQueriesContext(connection) as ctx:
+            product.save()
+        self.assertEqual(len([q for q in ctx.captured_queries if '"catalog_category"."slug"' in q['sql']]), 1)
+
+        product.category = self.other
+        with CaptureQueriesContext(connection) as ctx:
+            product.save()
+        self.assertEqual(len([q for q in ctx.captured_queries if '"catalog_category"."slug"' in q['sql']]), 1)
+
+    def test_moving_product_invalidates_both_categories(self):
+        bags = reverse('catalog:category', kwargs={'slug': 'bags'})
+        self._warm()
+        self.client.get(bags)
+
+        self.product.category = self.other
+        self.product.save()
+
+        self.assertNotContains(self.client.get(self.urls['category']), 'Runner')
+        self.assertContains(self.client.get(bags), 'Runner')
+
+    def test_category_rename_invalidates_list(self):
+        self._warm()
+        self.category.name = 'Sneakers'
+        self.category.save()
+
+        self.assertContains(self.client.get(self.urls['list']), 'Sneakers')
+
+    def test_size_change_invalidates_detail(self):
+        self._warm()
+        ProductSize.objects.create(product=self.product, label='UK 9')
+
+        self.assertContains(self.client.get(self.urls['detail']), 'UK 9')
+
+    def test_review_invalidates_detail_and_list(self):
+        self._warm()
+        ProductReview.objects.create(product=self.product, name='Asha', rating=4, comment='Comfy soles')
+
+        self.assertContains(self.client.get(self.urls['detail']), 'Comfy soles')
+        self.assertContains(self.client.get(self.urls['list']), '(1)')
+
+
+class ProductImageVariantTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = self.settings(MEDIA_ROOT=media_root, IMAGE_VARIANTS_IN_BACKGROUND=False)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.category = Category.objects.create(name='Shoes', slug='shoes')
+
+    def _upload(self, name='runner.jpg', size=(1000, 500)):
+        from PIL import Image
+
+        buffer = BytesIO()
+        Image.new('RGB', size, (200, 40, 40)).save(buffer, format='JPEG')
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+    def _render(self, product):
+        template = Template('{% load catalog_images %}{% responsive_image product.image sizes="300px" alt="Runner" %}')
+        return template.render(Context({'product': product}))
+
+    def test_variants_are_built_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            product = Product.objects.create(
+                category=self.category, name='Runner', slug='runner', price=10, image=self._upload()
+            )
+            self.assertEqual(product.image_variants, {})
+
+        product.refresh_from_db()
+        entry = product.image_variants['image']
+        self.assertEqual(entry['src'], product.image.name)
+        self.assertEqual(entry['width'], 1000)
+        expected = [(width, ext) for width in (200, 400, 800) for ext in ('webp', 'jpg')]
+        self.assertEqual([(width, ext) for width, ext, _ in entry['variants']], expected)
+
+        html = self._render(product)
+        self.assertIn('<picture><source type="image/webp"', html)
+        self.assertIn('_w200.webp 200w', html)
+        self.assertIn(f"{product.image.url} 1000w", html)
+        self.assertIn('sizes="300px"', html)
+
+    def test_unchanged_images_schedule_no_work(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            product = Product.objects.create(
+                category=self.category, name='Runner', slug='runner', price=10, image=self._upload()
+            )
+        product.refresh_from_db()
+
+        product.stock = 3
+        with self.captureOnCommitCallbacks() as callbacks:
+            product.save()
+        self.assertEqual(callbacks, [])
+
+    def test_small_image_renders_plain_tag(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            product = Product.objects.create(
+                category=self.category, name='Runner', slug='runner', price=10, image=self._upload(size=(150, 150))
+            )
+        product.refresh_from_db()
+
+        self.assertEqual(product.image_variants['image']['variants'], [])
+        self.assertEqual(self._render(product), f'<img alt="Runner" loading="lazy" src="{product.image.url}">')
+
+
+class RatingAggregateTests(TestCase):
+    def setUp(self):
+        category = Category.objects.create(name='Shoes', slug='shoes')
+        self.product = Product.objects.create(category=category, name='Runner', slug='runner', price=10)
+
+    def _review(self, rating, **kwargs):
+        return ProductReview.objects.create(product=self.product, name='Guest', rating=rating, **kwargs)
+
+    def _counters(self):
+        product = Product.objects.get(pk=self.product.pk)
+        return product.rating_count, product.rating_sum, [count for _, count in product.rating_histogram]
+
+    def test_review_changes_apply_deltas(self):
+        five = self._review(5)
+        three = self._review(3)
+        self.assertEqual(self._counters(), (2, 8, [1, 0, 1, 0, 0]))
+
+        three = ProductReview.objects.get(pk=three.pk)
+        three.rating = 4
+        three.save()
+        self.assertEqual(self._counters(), (2, 9, [1, 1, 0, 0, 0]))
+
+        three.is_active = False
+        three.save()
+        self.assertEqual(self._counters(), (1, 5, [1, 0, 0, 0, 0]))
+
+        self._review(2, is_active=False)
+        self.assertEqual(self._counters(), (1, 5, [1, 0, 0, 0, 0]))
+
+        ProductReview.objects.get(pk=five.pk).delete()
+        self.assertEqual(self._counters(), (0, 0, [0, 0, 0, 0, 0]))
+
+    def test_product_save_keeps_concurrent_rating_updates(self):
+        stale = Product.objects.get(pk=self.product.pk)
+        self._review(4)
+
+        stale.price = 12
+        stale.save()
+
+        self.assertEqual(self._counters(), (1, 4, [0, 1, 0, 0, 0]))
+        self.assertEqual(Product.objects.get(pk=self.product.pk).price, 12)
+
+    def test_rebuild_ratings_repairs_drifted_counters(self):
+        self._review(5)
+        self._review(1)
+        Product.objects.filter(pk=self.product.pk).update(rating_count=7, rating_sum=0, rating_5=0)
+
+        self.assertEqual(rebuild_ratings(), 1)
+        self.assertEqual(self._counters(), (2, 6, [1, 0, 0, 0, 1]))
+        self.assertEqual(rebuild_ratings(), 0)
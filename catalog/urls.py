@@ -9,5 +9,6 @@ urlpatterns = [
     path('category/<slug:slug>/', views.product_list, name='category'),
     path('contact/', views.contact_us, name='contact_us'),
     path('product/<slug:slug>/', views.product_detail, name='product_detail'),
+    path('product/<slug:slug>/reviews/', views.product_reviews, name='product_reviews'),
     path('product/<slug:slug>/review/', views.product_review_create, name='product_review_create'),
 ]
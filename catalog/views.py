@@ -1,56 +1,69 @@
+from urllib.parse import urlencode
+
 from django.conf import settings
 from django.db.models import Prefetch
 from django.contrib import messages
-from django.core.mail import EmailMessage
 from django.shortcuts import get_object_or_404, render
 from django.shortcuts import redirect
 from django.templatetags.static import static
+from django.urls import reverse
 from django.views.decorators.http import require_POST
 
+from . import cache as catalog_cache
 from .forms import ContactUsForm, ProductReviewForm
 from .models import Category, Product, ProductReview, ProductSize
+from .outbox import enqueue_email
+from .pagination import KeysetPaginator, RankedPaginator, page_url
+from .reviews import DUPLICATE, RATE_LIMITED, submit_review
+from .search import search_products
 
 
-def product_list(request, slug=None):
-    categories = Category.objects.filter(is_active=True)
-    products = Product.objects.filter(is_active=True).select_related('category').prefetch_related(
-        Prefetch('sizes', queryset=ProductSize.objects.filter(is_active=True), to_attr='active_sizes')
-    )
+def _build_product_list(slug, query, cursor):
+    categories = list(Category.objects.filter(is_active=True))
+    products = Product.objects.filter(is_active=True).select_related('category').defer('search_document')
     selected_category = None
 
     if slug:
         selected_category = get_object_or_404(Category, slug=slug, is_active=True)
         products = products.filter(category=selected_category)
 
-    query = (request.GET.get('q') or '').strip()
+    page_size = getattr(settings, 'CATALOG_PAGE_SIZE', 24)
     if query:
-        products = products.filter(name__icontains=query)
+        page = RankedPaginator(search_products(products, query), page_size).page(cursor)
+    else:
+        page = KeysetPaginator(products, page_size).page(cursor)
 
-    return render(
-        request,
-        'catalog/product_list.html',
-        {
-            'categories': categories,
-            'products': products,
-            'selected_category': selected_category,
-            'query': query,
-        },
-    )
+    return {'categories': categories, 'selected_category': selected_category, 'page': page}
 
 
-def product_detail(request, slug):
+def _reviews_page(product_id, cursor=None):
+    reviews = ProductReview.objects.filter(product_id=product_id, is_active=True).select_related('user')
+    return KeysetPaginator(reviews, getattr(settings, 'REVIEWS_PAGE_SIZE', 10)).page(cursor)
+
+
+def _build_product_detail(slug):
     product = get_object_or_404(
-        Product.objects.prefetch_related(
+        Product.objects.defer('search_document').prefetch_related(
             Prefetch('sizes', queryset=ProductSize.objects.filter(is_active=True), to_attr='active_sizes'),
-            Prefetch(
-                'reviews',
-                queryset=ProductReview.objects.filter(is_active=True).select_related('user'),
-                to_attr='active_reviews',
-            ),
         ),
         slug=slug,
         is_active=True,
     )
+    return {'product': product, 'reviews_page': _reviews_page(product.id)}
+
+
+def _product_detail_data(slug):
+    return catalog_cache.cached(
+        'product',
+        (slug,),
+        [catalog_cache.product_scope(slug)],
+        lambda: _build_product_detail(slug),
+    )
+
+
+def _render_product_detail(request, data, review_form):
+    product = data['product']
+    reviews_page = data['reviews_page']
     gallery_images = [img for img in [product.image, product.image2, product.image3, product.image4] if img]
     return render(
         request,
@@ -58,28 +71,69 @@ def product_detail(request, slug):
         {
             'product': product,
             'sizes': product.active_sizes,
-            'reviews': getattr(product, 'active_reviews', []),
-            'review_form': ProductReviewForm(),
+            'reviews': reviews_page.object_list,
+            'reviews_next_url': _reviews_url(product, reviews_page.next_cursor),
+            'review_form': review_form,
             'gallery_images': gallery_images,
         },
     )
 
 
+def _reviews_url(product, cursor):
+    if not cursor:
+        return None
+    return f"{reverse('catalog:product_reviews', kwargs={'slug': product.slug})}?{urlencode({'cursor': cursor})}"
+
+
+def product_list(request, slug=None):
+    query = (request.GET.get('q') or '').strip()
+    cursor = request.GET.get('cursor') or ''
+    data = catalog_cache.cached(
+        'list',
+        (slug, query, cursor),
+        catalog_cache.list_scopes(slug),
+        lambda: _build_product_list(slug, query, cursor),
+    )
+    page = data['page']
+
+    return render(
+        request,
+        'catalog/product_list.html',
+        {
+            'categories': data['categories'],
+            'products': page.object_list,
+            'page': page,
+            'next_page_url': page_url(request, page.next_cursor),
+            'prev_page_url': page_url(request, page.prev_cursor),
+            'selected_category': data['selected_category'],
+            'query': query,
+        },
+    )
+
+
+def product_detail(request, slug):
+    return _render_product_detail(request, _product_detail_data(slug), ProductReviewForm())
+
+
+def product_reviews(request, slug):
+    cursor = request.GET.get('cursor') or ''
+
+    def build():
+        product = get_object_or_404(Product.objects.only('id', 'slug'), slug=slug, is_active=True)
+        page = _reviews_page(product.id, cursor)
+        return {'reviews': page.object_list, 'next_url': _reviews_url(product, page.next_cursor)}
+
+    data = catalog_cache.cached('reviews', (slug, cursor), [catalog_cache.product_scope(slug)], build)
+    return render(
+        request,
+        'catalog/review_list.html',
+        {'reviews': data['reviews'], 'reviews_next_url': data['next_url']},
+    )
+
+
 @require_POST
 def product_review_create(request, slug):
-    product = get_object_or_404(
-        Product.objects.prefetch_related(
-            Prefetch('sizes', queryset=ProductSize.objects.filter(is_active=True), to_attr='active_sizes'),
-            Prefetch(
-                'reviews',
-                queryset=ProductReview.objects.filter(is_active=True).select_related('user'),
-                to_attr='active_reviews',
-            ),
-        ),
-        slug=slug,
-        is_active=True,
-    )
-    gallery_images = [img for img in [product.image, product.image2, product.image3, product.image4] if img]
+    product = get_object_or_404(Product.objects.only('id', 'slug'), slug=slug, is_active=True)
 
     form = ProductReviewForm(request.POST)
     if form.is_valid():
@@ -90,30 +144,28 @@ def product_review_create(request, slug):
         elif not name:
             name = 'Customer'
 
-        ProductReview.objects.create(
-            product=product,
-            user=request.user if is_auth else None,
-            name=name,
-            rating=int(form.cleaned_data['rating']),
-            comment=form.cleaned_data.get('comment', ''),
-            is_active=True,
-        )
-
-        messages.success(request, 'Review submitted.')
+        try:
+            result = submit_review(
+                request,
+                product,
+                rating=int(form.cleaned_data['rating']),
+                name=name,
+                comment=form.cleaned_data.get('comment', ''),
+            )
+        except Exception:
+            messages.error(request, 'Could not save your review right now. Please try again later.')
+            return _render_product_detail(request, _product_detail_data(slug), form)
+
+        if result == RATE_LIMITED:
+            messages.error(request, 'You are submitting reviews too quickly. Please try again later.')
+        elif result == DUPLICATE:
+            messages.info(request, 'We already received this review.')
+        else:
+            messages.success(request, 'Review submitted.')
         return redirect('catalog:product_detail', slug=product.slug)
 
     messages.error(request, 'Please correct the errors below.')
-    return render(
-        request,
-        'catalog/product_detail.html',
-        {
-            'product': product,
-            'sizes': product.active_sizes,
-            'reviews': getattr(product, 'active_reviews', []),
-            'review_form': form,
-            'gallery_images': gallery_images,
-        },
-    )
+    return _render_product_detail(request, _product_detail_data(slug), form)
 
 
 def contact_us(request):
@@ -154,16 +206,14 @@ def contact_us(request):
             body_lines.extend(['', 'Message:', message_text])
             body = '\n'.join(body_lines)
 
-            email_message = EmailMessage(
-                subject=subject,
-                body=body,
-                from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', ''),
-                to=[contact_email],
-                reply_to=[email] if email else [],
-            )
-
             try:
-                email_message.send(fail_silently=False)
+                enqueue_email(
+                    subject=subject,
+                    body=body,
+                    from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', ''),
+                    to=[contact_email],
+                    reply_to=[email] if email else [],
+                )
             except Exception:
                 messages.error(request, 'Could not send your message right now. Please try again later.')
             else:
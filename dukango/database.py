@@ -0,0 +1,74 @@
+import os
+
+import dj_database_url
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+def _env_flag(name, default):
+    return os.environ.get(name, default) == '1'
+
+
+def postgres_settings(database_url):
+    pgbouncer = _env_flag('DJANGO_DB_PGBOUNCER', '0')
+    config = dj_database_url.parse(
+        database_url,
+        conn_max_age=_env_int('DJANGO_DB_CONN_MAX_AGE', '600'),
+        conn_health_checks=_env_flag('DJANGO_DB_CONN_HEALTH_CHECKS', '1'),
+        ssl_require=_env_flag('DJANGO_DB_SSL_REQUIRE', '1'),
+    )
+    options = config.setdefault('OPTIONS', {})
+    options.setdefault('connect_timeout', _env_int('DJANGO_DB_CONNECT_TIMEOUT', '10'))
+
+    if pgbouncer:
+        # Transaction pooling hands each transaction to any server connection, so
+        # named cursors and startup parameters would not survive; set timeouts on the role.
+        config['DISABLE_SERVER_SIDE_CURSORS'] = True
+    else:
+        timeouts = {
+            'statement_timeout': _env_int('DJANGO_DB_STATEMENT_TIMEOUT_MS', '30000'),
+            'lock_timeout': _env_int('DJANGO_DB_LOCK_TIMEOUT_MS', '5000'),
+            'idle_in_transaction_session_timeout': _env_int('DJANGO_DB_IDLE_IN_TRANSACTION_TIMEOUT_MS', '60000'),
+        }
+        flags = ' '.join(f"-c {name}={value}" for name, value in timeouts.items() if value > 0)
+        if flags:
+            options['options'] = f"{options.get('options', '')} {flags}".strip()
+    return config
+
+
+def lift_migration_timeouts(sender, using='default', **kwargs):
+    from django.db import connections
+
+    connection = connections[using]
+    startup_options = connection.settings_dict.get('OPTIONS', {}).get('options', '')
+    names = [name for name in ('statement_timeout', 'lock_timeout') if f"-c {name}=" in startup_options]
+    if connection.vendor != 'postgresql' or not names:
+        return
+    with connection.cursor() as cursor:
+        for name in names:
+            cursor.execute(f"SET {name} = 0")
+
+
+def sqlite_settings(path):
+    return {
+        'ENGINE': 'dukango.sqlite3',
+        'NAME': os.environ.get('DJANGO_SQLITE_PATH') or path,
+        'CONN_MAX_AGE': _env_int('DJANGO_DB_CONN_MAX_AGE', '0'),
+        'CONN_HEALTH_CHECKS': _env_flag('DJANGO_DB_CONN_HEALTH_CHECKS', '0'),
+        'OPTIONS': {
+            'timeout': _env_int('DJANGO_SQLITE_BUSY_TIMEOUT_MS', '5000') / 1000,
+            'pragmas': {
+                'journal_mode': os.environ.get('DJANGO_SQLITE_JOURNAL_MODE', 'wal'),
+                'synchronous': os.environ.get('DJANGO_SQLITE_SYNCHRONOUS', 'normal'),
+                'busy_timeout': _env_int('DJANGO_SQLITE_BUSY_TIMEOUT_MS', '5000'),
+            },
+        },
+    }
+
+
+def database_settings(database_url, sqlite_path):
+    if database_url:
+        return postgres_settings(database_url)
+    return sqlite_settings(sqlite_path)
@@ -0,0 +1,127 @@
+import importlib.util
+import multiprocessing
+import os
+
+WORKER_CLASSES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'gevent': 'gevent',
+    'asgi': 'uvicorn.workers.UvicornWorker',
+}
+OPTIONAL_MODULES = {
+    'gevent': 'gevent',
+    'asgi': 'uvicorn',
+}
+
+
+def _env_int(name, default):
+    value = os.environ.get(name, '')
+    return int(value) if value.strip() else default
+
+
+def cpu_count():
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except (AttributeError, OSError):
+        return max(1, multiprocessing.cpu_count())
+
+
+def memory_limit_mb():
+    for path in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        try:
+            with open(path) as fh:
+                raw = fh.read().strip()
+        except OSError:
+            continue
+        if raw.isdigit() and int(raw) < 1 << 60:
+            return int(raw) // (1024 * 1024)
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def serving_mode():
+    mode = os.environ.get('DJANGO_SERVE_MODE', 'gthread').strip().lower()
+    if mode not in WORKER_CLASSES:
+        mode = 'gthread'
+    module = OPTIONAL_MODULES.get(mode)
+    if module and importlib.util.find_spec(module) is None:
+        mode = 'gthread'
+    return mode
+
+
+def shared_cache():
+    backend = os.environ.get('DJANGO_CACHE_BACKEND', '').strip().lower()
+    if not backend and os.environ.get('REDIS_URL', '').strip():
+        backend = 'redis'
+    return bool(backend) and 'locmem' not in backend
+
+
+def worker_count(cpus, memory_mb):
+    workers = _env_int('WEB_CONCURRENCY', 0)
+    if workers > 0:
+        return workers
+    workers = cpus * 2 + 1
+    if memory_mb:
+        workers = min(workers, memory_mb // _env_int('GUNICORN_WORKER_MEMORY_MB', 160))
+    return max(1, workers)
+
+
+def thread_count(mode, cpus):
+    if mode != 'gthread':
+        return 1
+    return max(1, _env_int('GUNICORN_THREADS', min(8, cpus * 4)))
+
+
+mode = serving_mode()
+cpus = cpu_count()
+memory_mb = memory_limit_mb()
+
+wsgi_app = 'dukango.asgi:application' if mode == 'asgi' else 'dukango.wsgi:application'
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+worker_class = WORKER_CLASSES[mode]
+workers = worker_count(cpus, memory_mb)
+threads = thread_count(mode, cpus)
+worker_connections = _env_int('GUNICORN_WORKER_CONNECTIONS', 200)
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10)
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None
+
+
+def on_starting(server):
+    server.log.info(
+        'Serving profile: mode=%s workers=%s threads=%s cpus=%s memory_mb=%s preload=%s shared_cache=%s',
+        mode,
+        workers,
+        threads,
+        cpus,
+        memory_mb,
+        preload_app,
+        shared_cache(),
+    )
+    if workers > 1 and not shared_cache():
+        server.log.warning(
+            'Running %s workers on a per-process cache: catalog versions, payment methods and review rate limits '
+            'are not shared between them. Set REDIS_URL or DJANGO_CACHE_BACKEND to a shared cache.',
+            workers,
+        )
+
+
+def pre_fork(server, worker):
+    from django.db import connections
+
+    connections.close_all()
+
+
+def post_fork(server, worker):
+    from django.db import connections
+
+    for conn in connections.all(initialized_only=True):
+        conn.connection = None
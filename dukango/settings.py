@@ -1,7 +1,7 @@
 from pathlib import Path
 import os
 
-import dj_database_url
+from .database import database_settings
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -36,6 +36,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'cart.middleware.CartCookieMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -63,15 +64,24 @@ WSGI_APPLICATION = 'dukango.wsgi.application'
 
 DATABASE_URL = os.environ.get('DATABASE_URL', '')
 
-if DATABASE_URL:
-    DATABASES = {'default': dj_database_url.parse(DATABASE_URL, conn_max_age=600, ssl_require=True)}
-else:
-    DATABASES = {
-        'default': {
-            'ENGINE': 'django.db.backends.sqlite3',
-            'NAME': BASE_DIR / 'db.sqlite3',
-        }
+DATABASES = {'default': database_settings(DATABASE_URL, BASE_DIR / 'db.sqlite3')}
+
+REDIS_URL = os.environ.get('REDIS_URL', '')
+DEFAULT_CACHE_BACKEND = (
+    'django.core.cache.backends.redis.RedisCache' if REDIS_URL else 'django.core.cache.backends.locmem.LocMemCache'
+)
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('DJANGO_CACHE_BACKEND') or DEFAULT_CACHE_BACKEND,
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION') or REDIS_URL or 'dukango-default',
     }
+}
+
+CATALOG_CACHE_ALIAS = 'default'
+CATALOG_CACHE_TIMEOUT = int(os.environ.get('DJANGO_CATALOG_CACHE_TIMEOUT', '600'))
+
+PAYMENT_METHODS_TTL = int(os.environ.get('DJANGO_PAYMENT_METHODS_TTL', '30'))
 
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -91,6 +101,7 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+IMAGE_VARIANTS_IN_BACKGROUND = os.environ.get('DJANGO_IMAGE_VARIANTS_IN_BACKGROUND', '1') == '1'
 
 STORAGES = {
     'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
@@ -123,6 +134,20 @@ EMAIL_HOST_USER = os.environ.get('DJANGO_EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.environ.get('DJANGO_EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.environ.get('DJANGO_DEFAULT_FROM_EMAIL', EMAIL_HOST_USER or 'no-reply@dukango.local')
 
+CART_STORAGE = os.environ.get('DJANGO_CART_STORAGE', 'cookie')
+
+CATALOG_PAGE_SIZE = int(os.environ.get('DJANGO_CATALOG_PAGE_SIZE', '24'))
+REVIEWS_PAGE_SIZE = int(os.environ.get('DJANGO_REVIEWS_PAGE_SIZE', '10'))
+ORDERS_PAGE_SIZE = int(os.environ.get('DJANGO_ORDERS_PAGE_SIZE', '20'))
+TRUSTED_PROXY_COUNT = int(os.environ.get('DJANGO_TRUSTED_PROXY_COUNT', '0'))
+REVIEW_RATE_BURST = int(os.environ.get('DJANGO_REVIEW_RATE_BURST', '3'))
+REVIEW_RATE_PER_HOUR = int(os.environ.get('DJANGO_REVIEW_RATE_PER_HOUR', '10'))
+
+OUTBOX_SEND_IN_BACKGROUND = os.environ.get('DJANGO_OUTBOX_SEND_IN_BACKGROUND', '1') == '1'
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_BACKOFF = 60
+
 CONTACT_TO_EMAIL = os.environ.get('DJANGO_CONTACT_TO_EMAIL', 'tredarssr@gmail.com')
 
 WHATSAPP_QR_STATIC_PATH = os.environ.get(
@@ -1,8 +1,12 @@
 from django.contrib import admin, messages
 
-from .models import Order, OrderItem
+from .models import Order, OrderItem, OrderStatusEvent
+from .tracking import ALLOWED_FROM
+from .transitions import transition_orders
 
 from payments.models import Payment
+from payments.registry import get_payment_method
+from payments.state import transition_payments
 
 
 class OrderItemInline(admin.TabularInline):
@@ -11,6 +15,17 @@ class OrderItemInline(admin.TabularInline):
     readonly_fields = ('product', 'product_name', 'size_label', 'unit_price', 'quantity', 'line_total')
 
 
+class OrderStatusEventInline(admin.TabularInline):
+    model = OrderStatusEvent
+    extra = 0
+    can_delete = False
+    fields = ('created_at', 'from_status', 'to_status', 'actor')
+    readonly_fields = ('created_at', 'from_status', 'to_status', 'actor')
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 class PaymentInline(admin.StackedInline):
     model = Payment
     extra = 0
@@ -45,12 +60,11 @@ class PaymentInline(admin.StackedInline):
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
-    list_display = ('order_code', 'full_name', 'phone', 'payment_method', 'manual_payment_method', 'status', 'total', 'created_at')
+    list_display = ('order_code', 'full_name', 'phone', 'payment_method', 'manual_payment_option', 'status', 'total', 'created_at')
     list_display_links = ('order_code',)
-    list_editable = ('status',)
     list_filter = ('status', 'payment_method', 'manual_payment_method', 'created_at')
     search_fields = ('order_code', 'id', 'full_name', 'phone')
-    inlines = [OrderItemInline, PaymentInline]
+    inlines = [OrderItemInline, PaymentInline, OrderStatusEventInline]
     readonly_fields = ('order_code',)
     actions = [
         'mark_payment_verified',
@@ -63,16 +77,21 @@ class OrderAdmin(admin.ModelAdmin):
         'mark_cancelled',
     ]
 
-    def _set_status(self, request, queryset, *, status, allowed_from=None):
-        updated = 0
-        skipped = 0
-        for order in queryset:
-            if allowed_from is not None and order.status not in allowed_from:
-                skipped += 1
-                continue
-            order.status = status
-            order.save()
-            updated += 1
+    def save_model(self, request, obj, form, change):
+        obj.save(actor=request.user)
+
+    @admin.display(description='Manual payment method', ordering='manual_payment_method__name')
+    def manual_payment_option(self, obj):
+        method = get_payment_method(obj.manual_payment_method_id)
+        return method.name if method else '-'
+
+    def _set_status(self, request, queryset, *, status):
+        updated, skipped = transition_orders(
+            queryset,
+            status=status,
+            allowed_from=ALLOWED_FROM[status],
+            actor=request.user,
+        )
 
         self.message_user(
             request,
@@ -80,18 +99,13 @@ class OrderAdmin(admin.ModelAdmin):
             level=messages.SUCCESS,
         )
 
+    def _set_payment_status(self, request, queryset, status):
+        total = queryset.count()
+        updated, _ = transition_payments(Payment.objects.filter(order__in=queryset), status, actor=request.user)
+        return updated, total - updated
+
     def mark_payment_verified(self, request, queryset):
-        updated = 0
-        skipped = 0
-        for order in queryset:
-            try:
-                payment = order.payment
-            except Payment.DoesNotExist:
-                skipped += 1
-                continue
-            payment.status = Payment.Status.VERIFIED
-            payment.save()
-            updated += 1
+        updated, skipped = self._set_payment_status(request, queryset, Payment.Status.VERIFIED)
         self.message_user(
             request,
             f"Verified payment for {updated} order(s). Skipped {skipped} order(s) without a payment record.",
@@ -99,17 +113,7 @@ class OrderAdmin(admin.ModelAdmin):
         )
 
     def mark_payment_failed(self, request, queryset):
-        updated = 0
-        skipped = 0
-        for order in queryset:
-            try:
-                payment = order.payment
-            except Payment.DoesNotExist:
-                skipped += 1
-                continue
-            payment.status = Payment.Status.FAILED
-            payment.save()
-            updated += 1
+        updated, skipped = self._set_payment_status(request, queryset, Payment.Status.FAILED)
         self.message_user(
             request,
             f"Marked payment failed for {updated} order(s). Skipped {skipped} order(s) without a payment record.",
@@ -118,56 +122,27 @@ class OrderAdmin(admin.ModelAdmin):
 
     @admin.action(description='Mark as Ready to Go')
     def mark_ready_to_go(self, request, queryset):
-        self._set_status(request, queryset, status=Order.Status.READY_TO_GO, allowed_from={Order.Status.PAID})
+        self._set_status(request, queryset, status=Order.Status.READY_TO_GO)
 
     @admin.action(description='Mark as Shipped')
     def mark_shipped(self, request, queryset):
-        self._set_status(
-            request,
-            queryset,
-            status=Order.Status.SHIPPED,
-            allowed_from={Order.Status.PAID, Order.Status.READY_TO_GO},
-        )
+        self._set_status(request, queryset, status=Order.Status.SHIPPED)
 
     @admin.action(description='Mark as Out for Delivery')
     def mark_out_for_delivery(self, request, queryset):
-        self._set_status(request, queryset, status=Order.Status.OUT_FOR_DELIVERY, allowed_from={Order.Status.SHIPPED})
+        self._set_status(request, queryset, status=Order.Status.OUT_FOR_DELIVERY)
 
     @admin.action(description='Mark as Arrived')
     def mark_arrived(self, request, queryset):
-        self._set_status(
-            request,
-            queryset,
-            status=Order.Status.ARRIVED,
-            allowed_from={Order.Status.OUT_FOR_DELIVERY},
-        )
+        self._set_status(request, queryset, status=Order.Status.ARRIVED)
 
     @admin.action(description='Mark as Delivered')
     def mark_delivered(self, request, queryset):
-        self._set_status(
-            request,
-            queryset,
-            status=Order.Status.DELIVERED,
-            allowed_from={Order.Status.OUT_FOR_DELIVERY, Order.Status.ARRIVED},
-        )
+        self._set_status(request, queryset, status=Order.Status.DELIVERED)
 
     @admin.action(description='Cancel order')
     def mark_cancelled(self, request, queryset):
-        self._set_status(
-            request,
-            queryset,
-            status=Order.Status.CANCELLED,
-            allowed_from={
-                Order.Status.PENDING_PAYMENT,
-                Order.Status.PAYMENT_SUBMITTED,
-                Order.Status.PLACED,
-                Order.Status.PAID,
-                Order.Status.READY_TO_GO,
-                Order.Status.SHIPPED,
-                Order.Status.OUT_FOR_DELIVERY,
-                Order.Status.ARRIVED,
-            },
-        )
+        self._set_status(request, queryset, status=Order.Status.CANCELLED)
 
 
 @admin.register(OrderItem)
@@ -1,8 +1,6 @@
 from django import forms
 
-from payments.models import PaymentMethod
-
-from .models import Order
+from payments.registry import active_payment_methods, get_payment_method, payment_method_choices
 
 
 class CheckoutForm(forms.Form):
@@ -14,44 +12,25 @@ class CheckoutForm(forms.Form):
     city = forms.CharField(max_length=120)
     state = forms.CharField(max_length=120)
     pincode = forms.CharField(max_length=12)
-    manual_payment_method = forms.ModelChoiceField(
-        queryset=PaymentMethod.objects.none(),
-        required=False,
-        empty_label=None,
-    )
+    manual_payment_method = forms.TypedChoiceField(coerce=int, required=False, choices=())
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        qs = PaymentMethod.objects.filter(is_active=True)
-        field = self.fields['manual_payment_method']
-        field.queryset = qs
-
-        def label_from_instance(obj):
-            label = obj.name
-            if obj.method_type == PaymentMethod.Type.QR:
-                return label
-            details = []
-            if obj.upi_id:
-                details.append(obj.upi_id)
-            elif obj.account_number:
-                tail = obj.account_number[-4:]
-                if tail:
-                    details.append(f"A/c ending {tail}")
-            if details:
-                label = f"{label} ({' | '.join(details)})"
-            return label
-
-        field.label_from_instance = label_from_instance
-
-        if qs.exists() and not self.is_bound:
-            self.initial.setdefault('manual_payment_method', qs.first())
+        methods = active_payment_methods()
+        self.fields['manual_payment_method'].choices = payment_method_choices()
+
+        if methods and not self.is_bound:
+            self.initial.setdefault('manual_payment_method', methods[0].pk)
 
     def clean(self):
         cleaned_data = super().clean()
-        if not self.fields['manual_payment_method'].queryset.exists():
+        if not active_payment_methods():
             self.add_error('manual_payment_method', 'No payment options are configured. Please contact support.')
             return cleaned_data
 
-        if not cleaned_data.get('manual_payment_method'):
+        method = get_payment_method(cleaned_data.get('manual_payment_method'), active_only=True)
+        if method is None:
             self.add_error('manual_payment_method', 'Select a payment option')
+        else:
+            cleaned_data['manual_payment_method'] = method
         return cleaned_data
@@ -0,0 +1,25 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from orders.models import Order
+from orders.queue import claim_orders
+
+
+class Command(BaseCommand):
+    help = 'Claim the next confirmed orders to pack and mark them Ready to Go.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=10, help='Number of orders to claim.')
+        parser.add_argument('--packer', default='', help='Username recorded on the status events.')
+
+    def handle(self, *args, **options):
+        actor = None
+        if options['packer']:
+            actor = get_user_model().objects.filter(username=options['packer']).first()
+            if actor is None:
+                raise CommandError(f"Unknown packer: {options['packer']}")
+
+        orders = claim_orders(Order.Status.PAID, options['limit'], to_status=Order.Status.READY_TO_GO, actor=actor)
+        for order in orders:
+            self.stdout.write(f"{order.order_code}\t{order.full_name}\t{order.city} {order.pincode}")
+        self.stdout.write(self.style.SUCCESS(f"Claimed {len(orders)} order(s) to pack."))
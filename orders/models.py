@@ -1,7 +1,8 @@
 import secrets
 
 from django.conf import settings
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
 
 
 class Order(models.Model):
@@ -64,20 +65,65 @@ class Order(models.Model):
     subtotal = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     shipping_fee = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     total = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    stock_reserved = models.BooleanField(default=False, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='orders_order_status_created'),
+            models.Index(fields=['user', 'created_at'], name='orders_order_user_created'),
+        ]
 
-    def save(self, *args, **kwargs):
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    def _reopens_cancelled(self):
+        return getattr(self, '_loaded_status', None) == self.Status.CANCELLED and self.status != self.Status.CANCELLED
+
+    def clean(self):
+        super().clean()
+        if self._reopens_cancelled():
+            raise ValidationError({'status': 'Cancelled orders cannot be reopened.'})
+
+    def save(self, *args, actor=None, **kwargs):
         if not self.order_code:
             self.order_code = self._generate_unique_order_code()
             update_fields = kwargs.get('update_fields')
             if update_fields is not None:
                 kwargs['update_fields'] = set(update_fields) | {'order_code'}
-        super().save(*args, **kwargs)
+
+        adding = self._state.adding
+        loaded_status = getattr(self, '_loaded_status', None)
+        update_fields = kwargs.get('update_fields')
+        changed = (update_fields is None or 'status' in update_fields) and (
+            adding or (loaded_status is not None and loaded_status != self.status)
+        )
+
+        if not changed:
+            super().save(*args, **kwargs)
+            self._loaded_status = self.status
+            return
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            OrderStatusEvent.objects.create(
+                order=self,
+                from_status='' if adding else loaded_status,
+                to_status=self.status,
+                actor=actor,
+            )
+            if self.status == self.Status.CANCELLED and not adding:
+                from .stock import release_stock
+
+                release_stock([self.pk])
+
+        self._loaded_status = self.status
 
     def __str__(self):
         return f"Order #{self.order_code}"
@@ -95,3 +141,23 @@ class OrderItem(models.Model):
 
     def __str__(self):
         return f"{self.product_name} x {self.quantity}"
+
+
+class OrderStatusEvent(models.Model):
+    order = models.ForeignKey(Order, related_name='status_events', on_delete=models.CASCADE)
+    from_status = models.CharField(max_length=20, choices=Order.Status.choices, blank=True)
+    to_status = models.CharField(max_length=20, choices=Order.Status.choices)
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['created_at', 'id']
+
+    def __str__(self):
+        return f"Order #{self.order_id}: {self.from_status or '-'} -> {self.to_status}"
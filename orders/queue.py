@@ -0,0 +1,17 @@
+from django.db import connection, transaction
+
+from .models import Order
+from .transitions import transition_orders
+
+
+def claim_orders(status, limit, *, to_status, actor=None):
+    with transaction.atomic():
+        qs = Order.objects.filter(status=status).order_by('created_at', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            qs = qs.select_for_update(skip_locked=True)
+        ids = list(qs.values_list('id', flat=True)[:limit])
+        if not ids:
+            return []
+
+        transition_orders(Order.objects.filter(id__in=ids), status=to_status, allowed_from={status}, actor=actor)
+        return list(Order.objects.filter(id__in=ids, status=to_status).order_by('created_at', 'id'))
@@ -0,0 +1,80 @@
+from django.db.models import Case, F, PositiveIntegerField, Sum, Value, When
+
+from catalog.models import Product
+
+
+class InsufficientStock(Exception):
+    def __init__(self, product_names):
+        self.product_names = list(product_names)
+        super().__init__(f"Insufficient stock for: {', '.join(self.product_names)}")
+
+
+def _lock_products(product_ids):
+    return dict(
+        Product.objects.select_for_update()
+        .filter(id__in=product_ids)
+        .order_by('id')
+        .values_list('id', 'stock')
+    )
+
+
+def _apply_stock_deltas(deltas):
+    deltas = {pid: delta for pid, delta in deltas.items() if delta}
+    if not deltas:
+        return 0
+    return Product.objects.filter(id__in=deltas).update(
+        stock=Case(
+            *[When(id=pid, then=F('stock') + Value(delta)) for pid, delta in deltas.items()],
+            default=F('stock'),
+            output_field=PositiveIntegerField(),
+        )
+    )
+
+
+def reserve_stock(items):
+    wanted = {}
+    names = {}
+    for item in items:
+        product = item['product']
+        wanted[product.id] = wanted.get(product.id, 0) + int(item['quantity'])
+        names[product.id] = product.name
+
+    if not wanted:
+        return
+
+    available = _lock_products(wanted)
+    short = [pid for pid in sorted(wanted) if available.get(pid, 0) < wanted[pid]]
+    if short:
+        raise InsufficientStock(names[pid] for pid in short)
+
+    _apply_stock_deltas({pid: -qty for pid, qty in wanted.items()})
+
+
+def release_stock(order_ids):
+    from .models import Order, OrderItem
+
+    order_ids = list(order_ids)
+    if not order_ids:
+        return
+
+    order_ids = list(
+        Order.objects.select_for_update()
+        .filter(id__in=order_ids, stock_reserved=True)
+        .order_by('id')
+        .values_list('id', flat=True)
+    )
+    if not order_ids:
+        return
+    Order.objects.filter(id__in=order_ids, stock_reserved=True).update(stock_reserved=False)
+
+    totals = dict(
+        OrderItem.objects.filter(order_id__in=order_ids)
+        .values('product_id')
+        .annotate(total=Sum('quantity'))
+        .values_list('product_id', 'total')
+    )
+    if not totals:
+        return
+
+    _lock_products(totals)
+    _apply_stock_deltas(totals)
@@ -0,0 +1,265 @@
+import threading
+import time
+from io import StringIO
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection, transaction
+from django.test import RequestFactory, TestCase, TransactionTestCase
+from django.urls import reverse
+
+from catalog.models import Category, Product
+from payments.models import PaymentMethod
+
+from .admin import OrderAdmin
+from .models import Order, OrderItem, OrderStatusEvent
+from .queue import claim_orders
+from .stock import InsufficientStock, reserve_stock
+
+
+class ReserveStockConcurrencyTests(TransactionTestCase):
+    buyers = 12
+
+    def test_parallel_reservations_do_not_oversell(self):
+        category = Category.objects.create(name='Shoes', slug='shoes')
+        product = Product.objects.create(category=category, name='Runner', slug='runner', price=10, stock=5)
+
+        outcomes = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(self.buyers)
+
+        def buy():
+            outcome = 'locked'
+            try:
+                barrier.wait()
+                for _ in range(100):
+                    try:
+                        with transaction.atomic():
+                            reserve_stock([{'product': product, 'quantity': 1}])
+                        outcome = 'sold'
+                    except InsufficientStock:
+                        outcome = 'short'
+                    except OperationalError:
+                        time.sleep(0.01)
+                        continue
+                    break
+            finally:
+                connection.close()
+            with lock:
+                outcomes.append(outcome)
+
+        threads = [threading.Thread(target=buy) for _ in range(self.buyers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        product.refresh_from_db()
+        self.assertEqual(outcomes.count('locked'), 0)
+        self.assertEqual(outcomes.count('sold'), 5)
+        self.assertEqual(outcomes.count('short'), self.buyers - 5)
+        self.assertEqual(product.stock, 0)
+
+
+class CheckoutQueryCountTests(TestCase):
+    checkout_queries = 17
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user('buyer', password='secret')
+        category = Category.objects.create(name='Shirts', slug='shirts')
+        self.products = [
+            Product.objects.create(category=category, name=f"Shirt {i}", slug=f"shirt-{i}", price=10, stock=100)
+            for i in range(30)
+        ]
+        self.method = PaymentMethod.objects.create(name='UPI', upi_id='shop@upi')
+        self.client.force_login(self.user)
+
+    def _assert_checkout_queries(self, lines):
+        for product in self.products[:lines]:
+            self.client.post(reverse('cart:add', args=[product.id]), {'quantity': 2})
+        self.client.get(reverse('orders:checkout'))
+
+        data = {
+            'full_name': 'Buyer',
+            'phone': '9999999999',
+            'address_line1': 'Street 1',
+            'city': 'Pune',
+            'state': 'MH',
+            'pincode': '411001',
+            'manual_payment_method': self.method.id,
+        }
+        with self.assertNumQueries(self.checkout_queries):
+            response = self.client.post(reverse('orders:checkout'), data)
+
+        order = Order.objects.get(user=self.user)
+        self.assertRedirects(response, reverse('payments:manual_payment', args=[order.id]), fetch_redirect_response=False)
+        self.assertEqual(order.items.count(), lines)
+
+    def test_single_line_checkout(self):
+        self._assert_checkout_queries(1)
+
+    def test_thirty_line_checkout_uses_same_query_count(self):
+        self._assert_checkout_queries(30)
+
+
+class OrderListQueryCountTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('buyer', password='secret')
+        category = Category.objects.create(name='Shirts', slug='shirts')
+        self.product = Product.objects.create(category=category, name='Shirt', slug='shirt', price=10)
+        self.client.force_login(self.user)
+
+    def _place_orders(self, count, lines):
+        for n in range(count):
+            order = Order.objects.create(
+                user=self.user,
+                full_name='Buyer',
+                phone='9999999999',
+                address_line1='Street 1',
+                city='Pune',
+                state='MH',
+                pincode='411001',
+            )
+            OrderItem.objects.bulk_create(
+                [
+                    OrderItem(
+                        order=order,
+                        product=self.product,
+                        product_name=f"Item {n}-{k}",
+                        unit_price=10,
+                        quantity=1,
+                        line_total=10,
+                    )
+                    for k in range(lines)
+                ]
+            )
+
+    def _assert_list_queries(self):
+        # session, user, orders page, item name previews
+        with self.assertNumQueries(4):
+            return self.client.get(reverse('orders:order_list'))
+
+    def test_query_count_is_constant(self):
+        self._place_orders(2, 1)
+        self._assert_list_queries()
+
+        self._place_orders(40, 6)
+        response = self._assert_list_queries()
+        self.assertEqual(len(response.context['orders']), 20)
+        self.assertIsNotNone(response.context['next_page_url'])
+
+    def test_lists_item_count_and_name_preview(self):
+        self._place_orders(1, 5)
+        order = self._assert_list_queries().context['orders'][0]
+
+        self.assertEqual(order.item_count, 5)
+        self.assertEqual(order.item_names, ['Item 0-0', 'Item 0-1', 'Item 0-2'])
+        self.assertEqual(order.more_items, 2)
+
+
+class OrderCancellationTests(TestCase):
+    def setUp(self):
+        category = Category.objects.create(name='Shirts', slug='shirts')
+        self.product = Product.objects.create(category=category, name='Shirt', slug='shirt', price=10, stock=5)
+        self.order = Order.objects.create(
+            full_name='Buyer',
+            phone='9999999999',
+            address_line1='Street 1',
+            city='Pune',
+            state='MH',
+            pincode='411001',
+            stock_reserved=True,
+        )
+        OrderItem.objects.create(
+            order=self.order, product=self.product, product_name='Shirt', unit_price=10, quantity=2, line_total=20
+        )
+
+    def _set_status(self, status):
+        order = Order.objects.get(pk=self.order.pk)
+        order.status = status
+        return order
+
+    def test_cancelling_twice_releases_stock_once(self):
+        self._set_status(Order.Status.CANCELLED).save()
+        self._set_status(Order.Status.PENDING_PAYMENT).save()
+        self._set_status(Order.Status.CANCELLED).save()
+
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 7)
+
+    def test_reopening_is_rejected_by_validation_only(self):
+        self._set_status(Order.Status.CANCELLED).save()
+        order = self._set_status(Order.Status.PENDING_PAYMENT)
+
+        with self.assertRaises(ValidationError) as ctx:
+            order.clean()
+        self.assertIn('status', ctx.exception.message_dict)
+        order.save()
+        self.assertEqual(Order.objects.get(pk=order.pk).status, Order.Status.PENDING_PAYMENT)
+
+
+class PackingQueueTests(TestCase):
+    def setUp(self):
+        self.packer = get_user_model().objects.create_user('packer', password='secret')
+        self.paid = [self._order(Order.Status.PAID) for _ in range(3)]
+        self._order(Order.Status.PENDING_PAYMENT)
+
+    def _order(self, status):
+        return Order.objects.create(
+            full_name='Buyer',
+            phone='9999999999',
+            address_line1='Street 1',
+            city='Pune',
+            state='MH',
+            pincode='411001',
+            status=status,
+        )
+
+    def test_claims_oldest_paid_orders_once(self):
+        first = claim_orders(Order.Status.PAID, 2, to_status=Order.Status.READY_TO_GO, actor=self.packer)
+        second = claim_orders(Order.Status.PAID, 2, to_status=Order.Status.READY_TO_GO, actor=self.packer)
+
+        self.assertEqual([o.pk for o in first], [o.pk for o in self.paid[:2]])
+        self.assertEqual([o.pk for o in second], [self.paid[2].pk])
+        self.assertEqual(claim_orders(Order.Status.PAID, 2, to_status=Order.Status.READY_TO_GO), [])
+        self.assertEqual(
+            OrderStatusEvent.objects.filter(to_status=Order.Status.READY_TO_GO, actor=self.packer).count(), 3
+        )
+
+    def test_pack_orders_command(self):
+        out = StringIO()
+        call_command('pack_orders', limit=5, packer='packer', stdout=out)
+
+        self.assertIn('Claimed 3 order(s) to pack.', out.getvalue())
+        self.assertIn(self.paid[0].order_code, out.getvalue())
+        self.assertFalse(Order.objects.filter(status=Order.Status.PAID).exists())
+        with self.assertRaises(CommandError):
+            call_command('pack_orders', packer='nobody', stdout=StringIO())
+
+
+class OrderAdminTests(TestCase):
+    def test_status_changes_from_the_change_form_record_the_actor(self):
+        staff = get_user_model().objects.create_superuser('staff', 'staff@example.com', 'secret')
+        order = Order.objects.create(
+            full_name='Buyer',
+            phone='9999999999',
+            address_line1='Street 1',
+            city='Pune',
+            state='MH',
+            pincode='411001',
+        )
+        request = RequestFactory().post('/')
+        request.user = staff
+        model_admin = OrderAdmin(Order, admin.site)
+
+        order = Order.objects.get(pk=order.pk)
+        order.status = Order.Status.PAID
+        model_admin.save_model(request, order, None, True)
+
+        event = OrderStatusEvent.objects.filter(order=order).latest('id')
+        self.assertEqual((event.to_status, event.actor), (Order.Status.PAID, staff))
+        self.assertNotIn('status', model_admin.list_editable)
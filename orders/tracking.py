@@ -0,0 +1,56 @@
+from collections import namedtuple
+
+from .models import Order
+
+TrackingStep = namedtuple('TrackingStep', ['value', 'label', 'done', 'current'])
+
+STEPS = (
+    Order.Status.PLACED,
+    Order.Status.PENDING_PAYMENT,
+    Order.Status.PAYMENT_SUBMITTED,
+    Order.Status.PAID,
+    Order.Status.READY_TO_GO,
+    Order.Status.SHIPPED,
+    Order.Status.OUT_FOR_DELIVERY,
+    Order.Status.ARRIVED,
+    Order.Status.DELIVERED,
+)
+
+OPTIONAL_STEPS = frozenset({Order.Status.READY_TO_GO, Order.Status.ARRIVED})
+TERMINAL_STATUSES = frozenset({Order.Status.DELIVERED, Order.Status.CANCELLED})
+
+
+def _build_steps(order_status):
+    progress = {status: index for index, status in enumerate(STEPS)}
+    steps = list(STEPS)
+    if order_status == Order.Status.CANCELLED:
+        progress[Order.Status.CANCELLED] = 0
+        steps.append(Order.Status.CANCELLED)
+
+    current = progress.get(order_status, 0)
+    return tuple(
+        TrackingStep(status, Order.Status(status).label, current >= progress[status], order_status == status)
+        for status in steps
+    )
+
+
+def _build_allowed_from():
+    allowed = {}
+    start = STEPS.index(Order.Status.PAID)
+    for index in range(start + 1, len(STEPS)):
+        sources = set()
+        for previous in reversed(STEPS[start:index]):
+            sources.add(previous)
+            if previous not in OPTIONAL_STEPS:
+                break
+        allowed[STEPS[index]] = frozenset(sources)
+    allowed[Order.Status.CANCELLED] = frozenset(s for s in Order.Status if s not in TERMINAL_STATUSES)
+    return allowed
+
+
+TRACKING_STEPS = {status: _build_steps(status) for status in Order.Status}
+ALLOWED_FROM = _build_allowed_from()
+
+
+def tracking_steps(order_status):
+    return TRACKING_STEPS.get(order_status) or _build_steps(order_status)
@@ -0,0 +1,36 @@
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Order, OrderStatusEvent
+
+
+def _after_transition(order_ids, status):
+    if status == Order.Status.CANCELLED:
+        from .stock import release_stock
+
+        release_stock(order_ids)
+
+
+def _is_eligible(current, status, allowed_from):
+    if allowed_from is not None and current not in allowed_from:
+        return False
+    return current != Order.Status.CANCELLED or status == Order.Status.CANCELLED
+
+
+def transition_orders(queryset, *, status, allowed_from=None, actor=None):
+    with transaction.atomic():
+        selected = list(queryset.select_for_update().order_by('id').values_list('id', 'status'))
+        rows = [(pk, current) for pk, current in selected if _is_eligible(current, status, allowed_from)]
+        order_ids = [pk for pk, _ in rows]
+
+        if order_ids:
+            Order.objects.filter(id__in=order_ids).update(status=status, updated_at=timezone.now())
+            OrderStatusEvent.objects.bulk_create(
+                [
+                    OrderStatusEvent(order_id=pk, from_status=old_status, to_status=status, actor=actor)
+                    for pk, old_status in rows
+                ]
+            )
+            _after_transition(order_ids, status)
+
+    return len(order_ids), len(selected) - len(order_ids)
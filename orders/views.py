@@ -1,59 +1,23 @@
 from decimal import Decimal
 
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import ObjectDoesNotExist
+from django.conf import settings
 from django.db import transaction
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
 from django.shortcuts import get_object_or_404, redirect, render
 
 from cart.utils import clear_cart, get_cart_items
+from catalog.pagination import KeysetPaginator, page_url
 
 from .forms import CheckoutForm
 from .models import Order, OrderItem
+from .stock import InsufficientStock, reserve_stock
+from .tracking import tracking_steps
 
-
-def _build_tracking_steps(order_status: str):
-    progress = {
-        Order.Status.PLACED: 0,
-        Order.Status.PENDING_PAYMENT: 1,
-        Order.Status.PAYMENT_SUBMITTED: 2,
-        Order.Status.PAID: 3,
-        Order.Status.READY_TO_GO: 4,
-        Order.Status.SHIPPED: 5,
-        Order.Status.OUT_FOR_DELIVERY: 6,
-        Order.Status.ARRIVED: 7,
-        Order.Status.DELIVERED: 8,
-    }
-
-    steps = [
-        Order.Status.PLACED,
-        Order.Status.PENDING_PAYMENT,
-        Order.Status.PAYMENT_SUBMITTED,
-        Order.Status.PAID,
-        Order.Status.READY_TO_GO,
-        Order.Status.SHIPPED,
-        Order.Status.OUT_FOR_DELIVERY,
-        Order.Status.ARRIVED,
-        Order.Status.DELIVERED,
-    ]
-
-    if order_status == Order.Status.CANCELLED:
-        progress[Order.Status.CANCELLED] = 0
-        steps.append(Order.Status.CANCELLED)
-
-    current = progress.get(order_status, 0)
-
-    tracking_steps = []
-    for status in steps:
-        tracking_steps.append(
-            {
-                'value': status,
-                'label': Order.Status(status).label,
-                'done': current >= progress[status],
-                'current': order_status == status,
-            }
-        )
-
-    return tracking_steps
+ORDER_PREVIEW_ITEMS = 3
 
 
 @login_required
@@ -71,45 +35,47 @@ def checkout(request):
             order_status = Order.Status.PENDING_PAYMENT
             manual_payment_method = form.cleaned_data.get('manual_payment_method')
 
-            with transaction.atomic():
-                order = Order.objects.create(
-                    user=request.user,
-                    full_name=form.cleaned_data['full_name'],
-                    phone=form.cleaned_data['phone'],
-                    address_line1=form.cleaned_data['address_line1'],
-                    address_line2=form.cleaned_data.get('address_line2', ''),
-                    city=form.cleaned_data['city'],
-                    state=form.cleaned_data['state'],
-                    pincode=form.cleaned_data['pincode'],
-                    payment_method=Order.PaymentMethod.MANUAL,
-                    manual_payment_method=manual_payment_method,
-                    status=order_status,
-                    subtotal=subtotal,
-                    shipping_fee=shipping_fee,
-                    total=total,
-                )
-
-                if not order.order_code:
-                    order.save(update_fields=['order_code'])
-
-                for item in items:
-                    product = item['product']
-                    qty = item['quantity']
-                    unit_price = product.selling_price
-                    line_total = unit_price * qty
-
-                    size = item.get('size')
-                    size_label = size.label if size else ''
-
-                    OrderItem.objects.create(
-                        order=order,
-                        product=product,
-                        size_label=size_label,
-                        product_name=product.name,
-                        unit_price=unit_price,
-                        quantity=qty,
-                        line_total=line_total,
+            try:
+                with transaction.atomic():
+                    reserve_stock(items)
+                    order = Order.objects.create(
+                        user=request.user,
+                        full_name=form.cleaned_data['full_name'],
+                        phone=form.cleaned_data['phone'],
+                        address_line1=form.cleaned_data['address_line1'],
+                        address_line2=form.cleaned_data.get('address_line2', ''),
+                        city=form.cleaned_data['city'],
+                        state=form.cleaned_data['state'],
+                        pincode=form.cleaned_data['pincode'],
+                        payment_method=Order.PaymentMethod.MANUAL,
+                        manual_payment_method=manual_payment_method,
+                        status=order_status,
+                        subtotal=subtotal,
+                        shipping_fee=shipping_fee,
+                        total=total,
+                        stock_reserved=True,
+                    )
+
+                    if not order.order_code:
+                        order.save(update_fields=['order_code'])
+
+                    OrderItem.objects.bulk_create(
+                        [
+                            OrderItem(
+                                order=order,
+                                product=item['product'],
+                                size_label=item['size'].label if item.get('size') else '',
+                                product_name=item['product'].name,
+                                unit_price=item['unit_price'],
+                                quantity=item['quantity'],
+                                line_total=item['line_total'],
+                            )
+                            for item in items
+                        ]
                     )
+            except InsufficientStock as exc:
+                messages.error(request, f"Not enough stock for: {', '.join(exc.product_names)}. Please update your cart.")
+                return redirect('cart:detail')
 
             clear_cart(request)
 
@@ -130,10 +96,43 @@ def checkout(request):
     )
 
 
+def _attach_item_previews(orders, limit=ORDER_PREVIEW_ITEMS):
+    previews = {}
+    if orders:
+        rows = (
+            OrderItem.objects.filter(order_id__in=[order.id for order in orders])
+            .annotate(position=Window(RowNumber(), partition_by=F('order_id'), order_by=F('id').asc()))
+            .filter(position__lte=limit)
+            .order_by('order_id', 'id')
+            .values_list('order_id', 'product_name')
+        )
+        for order_id, product_name in rows:
+            previews.setdefault(order_id, []).append(product_name)
+    for order in orders:
+        order.item_names = previews.get(order.id, [])
+        order.more_items = max(0, order.item_count - len(order.item_names))
+
+
 @login_required
 def order_list(request):
-    orders = Order.objects.filter(user=request.user).prefetch_related('items')
-    return render(request, 'orders/order_list.html', {'orders': orders})
+    orders = (
+        Order.objects.filter(user=request.user)
+        .only('id', 'order_code', 'status', 'payment_method', 'total', 'created_at')
+        .annotate(item_count=Count('items'))
+    )
+    page = KeysetPaginator(orders, getattr(settings, 'ORDERS_PAGE_SIZE', 20)).page(request.GET.get('cursor') or '')
+    _attach_item_previews(page.object_list)
+
+    return render(
+        request,
+        'orders/order_list.html',
+        {
+            'orders': page.object_list,
+            'page': page,
+            'next_page_url': page_url(request, page.next_cursor),
+            'prev_page_url': page_url(request, page.prev_cursor),
+        },
+    )
 
 
 @login_required
@@ -149,7 +148,7 @@ def order_detail(request, order_id):
     except ObjectDoesNotExist:
         payment = None
 
-    tracking_steps = _build_tracking_steps(order.status)
+    steps = tracking_steps(order.status)
 
     return render(
         request,
@@ -157,7 +156,7 @@ def order_detail(request, order_id):
         {
             'order': order,
             'payment': payment,
-            'tracking_steps': tracking_steps,
+            'tracking_steps': steps,
         },
     )
 
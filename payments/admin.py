@@ -1,6 +1,7 @@
 from django.contrib import admin
 
 from .models import Payment, PaymentMethod
+from .state import transition_payments
 
 
 @admin.register(PaymentMethod)
@@ -21,11 +22,7 @@ class PaymentAdmin(admin.ModelAdmin):
     actions = ['mark_verified', 'mark_failed']
 
     def mark_verified(self, request, queryset):
-        for payment in queryset:
-            payment.status = Payment.Status.VERIFIED
-            payment.save()
+        transition_payments(queryset, Payment.Status.VERIFIED, actor=request.user)
 
     def mark_failed(self, request, queryset):
-        for payment in queryset:
-            payment.status = Payment.Status.FAILED
-            payment.save()
+        transition_payments(queryset, Payment.Status.FAILED, actor=request.user)
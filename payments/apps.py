@@ -1,6 +1,22 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class PaymentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'payments'
+
+    def ready(self):
+        from . import qr, registry  # noqa: F401
+        from .models import PaymentMethod
+
+        post_save.connect(
+            registry.on_payment_method_changed,
+            sender=PaymentMethod,
+            dispatch_uid='payments.registry.method_saved',
+        )
+        post_delete.connect(
+            registry.on_payment_method_changed,
+            sender=PaymentMethod,
+            dispatch_uid='payments.registry.method_deleted',
+        )
@@ -65,18 +65,14 @@ class Payment(models.Model):
     def __str__(self):
         return f"Payment for Order #{self.order_id}"
 
-    def save(self, *args, **kwargs):
+    def save(self, *args, sync_order=True, **kwargs):
         super().save(*args, **kwargs)
+        if not sync_order:
+            return
 
-        from orders.models import Order
+        from .state import ORDER_TRANSITIONS
 
-        if self.status in {self.Status.CAPTURED, self.Status.VERIFIED} and self.order.status in {
-            Order.Status.PENDING_PAYMENT,
-            Order.Status.PAYMENT_SUBMITTED,
-        }:
-            self.order.status = Order.Status.PAID
-            self.order.save()
-
-        if self.status == self.Status.FAILED and self.order.status in {Order.Status.PAYMENT_SUBMITTED, Order.Status.PAID}:
-            self.order.status = Order.Status.PENDING_PAYMENT
+        rule = ORDER_TRANSITIONS.get(self.status)
+        if rule and self.order.status in rule[1]:
+            self.order.status = rule[0]
             self.order.save()
@@ -0,0 +1,35 @@
+import hashlib
+from functools import lru_cache
+from io import BytesIO
+
+try:
+    import qrcode
+    import qrcode.image.svg
+except ImportError:
+    qrcode = None
+
+QR_FORMATS = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+}
+
+
+def qr_available():
+    return qrcode is not None
+
+
+def qr_etag(upi_uri: str, fmt: str) -> str:
+    return '"' + hashlib.sha1(f"{fmt}:{upi_uri}".encode('utf-8')).hexdigest() + '"'
+
+
+@lru_cache(maxsize=256)
+def render_qr(upi_uri: str, fmt: str = 'png') -> bytes:
+    if qrcode is None:
+        raise RuntimeError('qrcode is not installed')
+
+    buffer = BytesIO()
+    if fmt == 'svg':
+        qrcode.make(upi_uri, image_factory=qrcode.image.svg.SvgPathImage).save(buffer)
+    else:
+        qrcode.make(upi_uri).save(buffer, format='PNG')
+    return buffer.getvalue()
@@ -0,0 +1,91 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import PaymentMethod
+
+VERSION_KEY = 'payments:methods:version'
+
+_loaded = (None, (), {}, ())
+_loaded_at = 0.0
+
+
+def payment_method_label(method):
+    label = method.name
+    if method.method_type == PaymentMethod.Type.QR:
+        return label
+    details = []
+    if method.upi_id:
+        details.append(method.upi_id)
+    elif method.account_number:
+        tail = method.account_number[-4:]
+        if tail:
+            details.append(f"A/c ending {tail}")
+    if details:
+        label = f"{label} ({' | '.join(details)})"
+    return label
+
+
+def _current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _expired():
+    ttl = getattr(settings, 'PAYMENT_METHODS_TTL', 30)
+    return time.monotonic() - _loaded_at >= ttl
+
+
+def _registry():
+    global _loaded, _loaded_at
+
+    version = _current_version()
+    if _loaded[0] != version or version is None or _expired():
+        methods = tuple(PaymentMethod.objects.all())
+        active = tuple(m for m in methods if m.is_active)
+        _loaded = (
+            version,
+            active,
+            {m.pk: m for m in methods},
+            tuple((m.pk, payment_method_label(m)) for m in active),
+        )
+        _loaded_at = time.monotonic()
+    return _loaded
+
+
+def active_payment_methods():
+    return _registry()[1]
+
+
+def payment_method_choices():
+    return _registry()[3]
+
+
+def get_payment_method(pk, *, active_only=False):
+    if not pk:
+        return None
+    method = _registry()[2].get(pk)
+    if method is None and not active_only:
+        method = PaymentMethod.objects.filter(pk=pk).first()
+    if method is not None and active_only and not method.is_active:
+        return None
+    return method
+
+
+def bump_payment_methods():
+    global _loaded
+
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), None)
+    _loaded = (None, (), {}, ())
+
+
+def on_payment_method_changed(sender, instance, raw=False, **kwargs):
+    transaction.on_commit(bump_payment_methods)
@@ -0,0 +1,56 @@
+from django.db import transaction
+from django.utils import timezone
+
+from orders.models import Order
+from orders.transitions import transition_orders
+
+from .models import Payment
+
+ORDER_TRANSITIONS = {
+    Payment.Status.CAPTURED: (Order.Status.PAID, {Order.Status.PENDING_PAYMENT, Order.Status.PAYMENT_SUBMITTED}),
+    Payment.Status.VERIFIED: (Order.Status.PAID, {Order.Status.PENDING_PAYMENT, Order.Status.PAYMENT_SUBMITTED}),
+    Payment.Status.FAILED: (Order.Status.PENDING_PAYMENT, {Order.Status.PAYMENT_SUBMITTED, Order.Status.PAID}),
+}
+
+
+def _sync_orders(order_ids, payment_status, actor=None):
+    rule = ORDER_TRANSITIONS.get(payment_status)
+    if rule is None or not order_ids:
+        return 0
+    order_status, allowed_from = rule
+    updated, _ = transition_orders(
+        Order.objects.filter(id__in=order_ids),
+        status=order_status,
+        allowed_from=allowed_from,
+        actor=actor,
+    )
+    return updated
+
+
+def transition_payments(queryset, status, *, actor=None):
+    with transaction.atomic():
+        rows = list(queryset.select_for_update().order_by('id').values_list('id', 'order_id'))
+        if not rows:
+            return 0, 0
+        Payment.objects.filter(id__in=[pk for pk, _ in rows]).update(status=status, updated_at=timezone.now())
+        orders_updated = _sync_orders([order_id for _, order_id in rows], status, actor)
+    return len(rows), orders_updated
+
+
+def submit_manual_payment(order, *, reference, proof=None, actor=None):
+    with transaction.atomic():
+        payment, _ = Payment.objects.get_or_create(order=order, defaults={'amount': order.total})
+        payment.provider = Payment.Provider.MANUAL
+        payment.amount = order.total
+        payment.manual_reference = reference
+        if proof:
+            payment.manual_proof = proof
+        payment.status = Payment.Status.SUBMITTED
+        payment.save(sync_order=False)
+        transition_orders(
+            Order.objects.filter(id=order.id),
+            status=Order.Status.PAYMENT_SUBMITTED,
+            allowed_from={Order.Status.PENDING_PAYMENT},
+            actor=actor,
+        )
+    return payment
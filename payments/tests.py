@@ -0,0 +1,118 @@
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from catalog.models import Category, Product
+from orders.models import Order
+
+from .models import Payment, PaymentMethod
+from .qr import qr_available
+from .registry import payment_method_choices
+from .state import submit_manual_payment
+
+
+def make_order(**kwargs):
+    return Order.objects.create(
+        full_name='Buyer',
+        phone='9999999999',
+        address_line1='Street 1',
+        city='Pune',
+        state='MH',
+        pincode='411001',
+        **kwargs,
+    )
+
+
+class PaymentStateTests(TestCase):
+    def test_saving_submitted_payment_leaves_order_status(self):
+        order = make_order()
+        Payment.objects.create(order=order, amount=order.total, status=Payment.Status.SUBMITTED)
+
+        order.refresh_from_db()
+        self.assertEqual(order.status, Order.Status.PENDING_PAYMENT)
+
+    def test_manual_submission_moves_order_to_payment_submitted(self):
+        order = make_order()
+        payment = submit_manual_payment(order, reference='UTR123')
+
+        order.refresh_from_db()
+        self.assertEqual(payment.status, Payment.Status.SUBMITTED)
+        self.assertEqual(order.status, Order.Status.PAYMENT_SUBMITTED)
+
+
+class PaymentRegistryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user('buyer', password='secret')
+        category = Category.objects.create(name='Shirts', slug='shirts')
+        self.product = Product.objects.create(category=category, name='Shirt', slug='shirt', price=10, stock=10)
+        self.method = PaymentMethod.objects.create(name='UPI', upi_id='shop@upi')
+        self.client.force_login(self.user)
+        self.client.post(reverse('cart:add', args=[self.product.id]), {'quantity': 1})
+
+    def _method_queries(self, ctx):
+        return [q['sql'] for q in ctx.captured_queries if 'payments_paymentmethod' in q['sql']]
+
+    def test_warm_checkout_does_not_query_payment_methods(self):
+        self.client.get(reverse('orders:checkout'))
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse('orders:checkout'))
+            response = self.client.post(
+                reverse('orders:checkout'),
+                {
+                    'full_name': 'Buyer',
+                    'phone': '9999999999',
+                    'address_line1': 'Street 1',
+                    'city': 'Pune',
+                    'state': 'MH',
+                    'pincode': '411001',
+                    'manual_payment_method': self.method.id,
+                },
+            )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self._method_queries(ctx), [])
+
+    @override_settings(PAYMENT_METHODS_TTL=0)
+    def test_expired_registry_reloads_without_version_bump(self):
+        payment_method_choices()
+        PaymentMethod.objects.filter(pk=self.method.pk).update(name='UPI Pay')
+
+        with CaptureQueriesContext(connection) as ctx:
+            choices = payment_method_choices()
+
+        self.assertEqual(len(self._method_queries(ctx)), 1)
+        self.assertEqual(dict(choices)[self.method.pk], 'UPI Pay (shop@upi)')
+
+
+@skipUnless(qr_available(), 'qrcode is not installed')
+class ManualPaymentQrTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user('buyer', password='secret')
+        self.method = PaymentMethod.objects.create(name='Scan', method_type=PaymentMethod.Type.QR, upi_id='shop@upi')
+        self.order = make_order(user=self.user, manual_payment_method=self.method, total=250)
+        self.url = reverse('payments:manual_payment_qr', args=[self.order.id, 'svg'])
+        self.client.force_login(self.user)
+
+    def test_qr_is_revalidated_and_changes_with_upi_id(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+        etag = response['ETag']
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.method.upi_id = 'new@upi'
+            self.method.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
@@ -6,4 +6,5 @@ app_name = 'payments'
 
 urlpatterns = [
     path('manual/<int:order_id>/', views.manual_payment, name='manual_payment'),
+    path('manual/<int:order_id>/qr.<str:fmt>', views.manual_payment_qr, name='manual_payment_qr'),
 ]
@@ -1,15 +1,18 @@
-import base64
-from io import BytesIO
 from urllib.parse import urlencode
 
 from django import forms
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.http import Http404, HttpResponse, HttpResponseNotModified
 from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
 
 from orders.models import Order
 
 from .models import Payment
+from .qr import QR_FORMATS, qr_available, qr_etag, render_qr
+from .registry import get_payment_method
+from .state import submit_manual_payment
 
 
 class ManualPaymentForm(forms.Form):
@@ -32,9 +35,21 @@ def _build_upi_uri(*, upi_id: str, payee_name: str, amount, note: str):
     return f"upi://pay?{urlencode(params)}"
 
 
+def _order_upi_uri(order):
+    payment_method = get_payment_method(order.manual_payment_method_id)
+    if not payment_method or payment_method.method_type != 'QR' or not payment_method.upi_id:
+        return None
+    return _build_upi_uri(
+        upi_id=payment_method.upi_id,
+        payee_name='Shope in home',
+        amount=order.total,
+        note=f"Order #{order.id}",
+    )
+
+
 @login_required
 def manual_payment(request, order_id):
-    order = get_object_or_404(Order.objects.select_related('manual_payment_method'), id=order_id, user=request.user)
+    order = get_object_or_404(Order, id=order_id, user=request.user)
 
     if order.payment_method != Order.PaymentMethod.MANUAL:
         return redirect('orders:order_detail', order_id=order.id)
@@ -54,40 +69,21 @@ def manual_payment(request, order_id):
     )
 
     if request.method == 'POST' and form.is_valid():
-        payment, _ = Payment.objects.get_or_create(order=order, defaults={'amount': order.total})
-        payment.provider = Payment.Provider.MANUAL
-        payment.amount = order.total
-        payment.manual_reference = form.cleaned_data['manual_reference']
-        if form.cleaned_data.get('manual_proof'):
-            payment.manual_proof = form.cleaned_data['manual_proof']
-        payment.status = Payment.Status.SUBMITTED
-        payment.save()
-
-        order.status = Order.Status.PAYMENT_SUBMITTED
-        order.save()
+        submit_manual_payment(
+            order,
+            reference=form.cleaned_data['manual_reference'],
+            proof=form.cleaned_data.get('manual_proof'),
+            actor=request.user,
+        )
 
         messages.success(request, 'Payment submitted. We will verify and confirm soon.')
         return redirect('orders:order_detail', order_id=order.id)
 
-    payment_method = order.manual_payment_method
-    qr_data_uri = None
-    upi_uri = None
-    if payment_method and payment_method.method_type == 'QR' and payment_method.upi_id:
-        upi_uri = _build_upi_uri(
-            upi_id=payment_method.upi_id,
-            payee_name='Shope in home',
-            amount=order.total,
-            note=f"Order #{order.id}",
-        )
-        try:
-            import qrcode
-
-            qr_img = qrcode.make(upi_uri)
-            buffer = BytesIO()
-            qr_img.save(buffer, format='PNG')
-            qr_data_uri = 'data:image/png;base64,' + base64.b64encode(buffer.getvalue()).decode('utf-8')
-        except Exception:
-            qr_data_uri = None
+    payment_method = get_payment_method(order.manual_payment_method_id)
+    upi_uri = _order_upi_uri(order)
+    qr_url = None
+    if upi_uri and qr_available():
+        qr_url = reverse('payments:manual_payment_qr', kwargs={'order_id': order.id, 'fmt': 'svg'})
 
     return render(
         request,
@@ -97,7 +93,27 @@ def manual_payment(request, order_id):
             'payment_method': payment_method,
             'payment': payment,
             'form': form,
-            'qr_data_uri': qr_data_uri,
+            'qr_url': qr_url,
             'upi_uri': upi_uri,
         },
     )
+
+
+@login_required
+def manual_payment_qr(request, order_id, fmt):
+    if fmt not in QR_FORMATS or not qr_available():
+        raise Http404('QR code unavailable.')
+
+    order = get_object_or_404(Order, id=order_id, user=request.user)
+    upi_uri = _order_upi_uri(order)
+    if not upi_uri:
+        raise Http404('QR code unavailable.')
+
+    etag = qr_etag(upi_uri, fmt)
+    if etag in [tag.strip() for tag in request.META.get('HTTP_IF_NONE_MATCH', '').split(',')]:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(render_qr(upi_uri, fmt), content_type=QR_FORMATS[fmt])
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response